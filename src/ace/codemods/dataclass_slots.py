@@ -4,16 +4,38 @@ Dataclass Slots Codemod - Add slots=True to @dataclass decorators.
 Guards: skip if multiple inheritance or existing __slots__.
 """
 
+import re
+
 import libcst as cst
 from libcst import matchers as m
 from pathlib import Path
 from typing import Optional
 
+from ace.codemods.dispatch import CachedDispatchTransformer
+from ace.codemods.parsing import parse_module_cached
 from ace.skills.python import EditPlan, Edit
 from ace.uir import create_uir
 
 
-class DataclassSlotsTransformer(cst.CSTTransformer):
+# A @dataclass or @dataclass(...) decorator line; files without one are
+# skipped before parsing
+_DATACLASS_RE = re.compile(r"^\s*@\s*dataclass\b", re.MULTILINE)
+
+# LibCST nodes are immutable, so one `slots=True` argument node can be
+# shared by every rewritten decorator
+_SLOTS_ARG = cst.Arg(
+    keyword=cst.Name("slots"),
+    value=cst.Name("True"),
+    equal=cst.AssignEqual(
+        whitespace_before=cst.SimpleWhitespace(""),
+        whitespace_after=cst.SimpleWhitespace("")
+    )
+)
+
+_DATACLASS_DECORATOR = m.Name("dataclass") | m.Call(func=m.Name("dataclass"))
+
+
+class DataclassSlotsTransformer(CachedDispatchTransformer):
     """Add slots=True to dataclass decorators."""
 
     def __init__(self):
@@ -35,9 +57,9 @@ class DataclassSlotsTransformer(cst.CSTTransformer):
                                 return updated_node
 
         # Check for @dataclass decorator
-        for decorator in updated_node.decorators:
+        for idx, decorator in enumerate(updated_node.decorators):
             dec = decorator.decorator
-            if m.matches(dec, m.Name("dataclass")) or m.matches(dec, m.Call(func=m.Name("dataclass"))):
+            if m.matches(dec, _DATACLASS_DECORATOR):
                 # Check if slots already present
                 if isinstance(dec, cst.Call):
                     has_slots = any(
@@ -49,23 +71,12 @@ class DataclassSlotsTransformer(cst.CSTTransformer):
                         continue
 
                     # Add slots=True
-                    new_args = list(dec.args) + [
-                        cst.Arg(
-                            keyword=cst.Name("slots"),
-                            value=cst.Name("True"),
-                            equal=cst.AssignEqual(
-                                whitespace_before=cst.SimpleWhitespace(""),
-                                whitespace_after=cst.SimpleWhitespace("")
-                            )
-                        )
-                    ]
+                    new_args = list(dec.args) + [_SLOTS_ARG]
                     new_dec = dec.with_changes(args=new_args)
                     new_decorator = decorator.with_changes(decorator=new_dec)
 
-                    new_decorators = [
-                        new_decorator if d == decorator else d
-                        for d in updated_node.decorators
-                    ]
+                    new_decorators = list(updated_node.decorators)
+                    new_decorators[idx] = new_decorator
 
                     self.changes.append(updated_node.name.value)
                     return updated_node.with_changes(decorators=new_decorators)
@@ -74,23 +85,12 @@ class DataclassSlotsTransformer(cst.CSTTransformer):
                     # @dataclass without parens -> @dataclass(slots=True)
                     new_dec = cst.Call(
                         func=cst.Name("dataclass"),
-                        args=[
-                            cst.Arg(
-                                keyword=cst.Name("slots"),
-                                value=cst.Name("True"),
-                                equal=cst.AssignEqual(
-                                    whitespace_before=cst.SimpleWhitespace(""),
-                                    whitespace_after=cst.SimpleWhitespace("")
-                                )
-                            )
-                        ]
+                        args=[_SLOTS_ARG]
                     )
                     new_decorator = decorator.with_changes(decorator=new_dec)
 
-                    new_decorators = [
-                        new_decorator if d == decorator else d
-                        for d in updated_node.decorators
-                    ]
+                    new_decorators = list(updated_node.decorators)
+                    new_decorators[idx] = new_decorator
 
                     self.changes.append(updated_node.name.value)
                     return updated_node.with_changes(decorators=new_decorators)
@@ -104,8 +104,11 @@ class DataclassSlotsCodemod:
     @staticmethod
     def plan(source_code: str, file_path: str) -> Optional[EditPlan]:
         """Generate edit plan."""
+        if not _DATACLASS_RE.search(source_code):
+            return None
+
         try:
-            tree = cst.parse_module(source_code)
+            tree = parse_module_cached(source_code)
         except Exception:
             return None
 
@@ -118,19 +121,17 @@ class DataclassSlotsCodemod:
         new_code = modified_tree.code
 
         finding = create_uir(
-            rule_id="PY_DATACLASS_SLOTS",
+            file=file_path,
+            line=1,
+            rule="PY_DATACLASS_SLOTS",
             severity="low",
             message=f"Add slots=True to dataclasses ({len(transformer.changes)} classes)",
-            file_path=file_path,
-            line=1,
-            snippet="",
-            context={}
         )
 
         edit = Edit(
             file=file_path,
             start_line=1,
-            end_line=len(source_code.split('\n')),
+            end_line=source_code.count("\n") + 1,
             op="replace",
             payload=new_code
         )
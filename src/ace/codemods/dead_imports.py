@@ -8,20 +8,23 @@ import logging
 
 import libcst as cst
 from libcst import matchers as m
-from libcst.metadata import Scope, QualifiedNameProvider, ScopeProvider
 from pathlib import Path
 from typing import Optional, Set
 
+from ace.codemods.dispatch import CachedDispatchTransformer, CachedDispatchVisitor
+from ace.codemods.parsing import parse_module_cached
 from ace.skills.python import EditPlan, Edit
 from ace.uir import create_uir
 
 logger = logging.getLogger(__name__)
 
+_FUTURE_ATTR = m.Attribute(value=m.Name("__future__"))
+_FUTURE_MODULE = m.Name("__future__")
+_TYPING_MODULE = m.Name("typing")
 
-class ImportCollector(cst.CSTVisitor):
-    """Collect all imports and their usage."""
 
-    METADATA_DEPENDENCIES = (ScopeProvider,)
+class ImportCollector(CachedDispatchVisitor):
+    """Collect all imports and their usage."""
 
     def __init__(self):
         self.imports = {}  # name -> Import node
@@ -56,7 +59,7 @@ class ImportCollector(cst.CSTVisitor):
             self.used_names.add(node.value.value)
 
 
-class DeadImportsRemover(cst.CSTTransformer):
+class DeadImportsRemover(CachedDispatchTransformer):
     """Remove unused imports."""
 
     def __init__(self, unused_imports: Set[str], has_annotations: bool):
@@ -67,68 +70,103 @@ class DeadImportsRemover(cst.CSTTransformer):
     def leave_SimpleStatementLine(
         self, original_node: cst.SimpleStatementLine, updated_node: cst.SimpleStatementLine
     ) -> cst.SimpleStatementLine | cst.RemovalSentinel:
-        """Remove import statements with unused imports."""
+        """Remove unused imports, keeping other statements on the same line."""
+        new_body = []
+        changed = False
         for stmt in updated_node.body:
-            if isinstance(stmt, cst.Import):
-                # Check if any names are unused
-                remaining_names = []
-                for name in stmt.names:
-                    if isinstance(name, cst.ImportAlias):
-                        imported_name = name.asname.name.value if name.asname else name.name.value
-
-                        # Guard: never remove __future__
-                        if m.matches(name.name, m.Attribute(value=m.Name("__future__"))):
-                            remaining_names.append(name)
-                            continue
-
-                        # Guard: keep typing imports if annotations present
-                        if self.has_annotations and imported_name == "typing":
-                            remaining_names.append(name)
-                            continue
-
-                        if imported_name not in self.unused_imports:
-                            remaining_names.append(name)
-                        else:
-                            self.changes.append(imported_name)
-
-                if not remaining_names and len(stmt.names) > 0:
-                    # Remove entire import
-                    return cst.RemovalSentinel.REMOVE
-                elif len(remaining_names) < len(stmt.names):
-                    # Update import with remaining names
-                    new_stmt = stmt.with_changes(names=remaining_names)
-                    return updated_node.with_changes(body=[new_stmt])
-
-            elif isinstance(stmt, cst.ImportFrom):
-                # Guard: never remove __future__
-                if stmt.module and m.matches(stmt.module, m.Name("__future__")):
-                    return updated_node
-
-                if isinstance(stmt.names, cst.ImportStar):
-                    return updated_node
-
-                remaining_names = []
-                for name in stmt.names:
-                    if isinstance(name, cst.ImportAlias):
-                        imported_name = name.asname.name.value if name.asname else name.name.value
-
-                        # Guard: keep typing.* if annotations present
-                        if self.has_annotations and stmt.module and m.matches(stmt.module, m.Name("typing")):
-                            remaining_names.append(name)
-                            continue
-
-                        if imported_name not in self.unused_imports:
-                            remaining_names.append(name)
-                        else:
-                            self.changes.append(imported_name)
-
-                if not remaining_names and len(stmt.names) > 0:
-                    return cst.RemovalSentinel.REMOVE
-                elif len(remaining_names) < len(stmt.names):
-                    new_stmt = stmt.with_changes(names=remaining_names)
-                    return updated_node.with_changes(body=[new_stmt])
-
-        return updated_node
+            prune = self._PRUNERS.get(type(stmt))
+            new_stmt = prune(self, stmt) if prune is not None else stmt
+
+            if new_stmt is not stmt:
+                changed = True
+            if new_stmt is not None:
+                new_body.append(new_stmt)
+
+        if not changed:
+            return updated_node
+        if not new_body:
+            return cst.RemovalSentinel.REMOVE
+        return updated_node.with_changes(body=new_body)
+
+    def _prune_import(self, stmt: cst.Import) -> cst.Import | None:
+        """Drop unused names from `import ...` (None if none remain)."""
+        remaining_names = []
+        # Import.names only ever holds ImportAlias nodes
+        for name in stmt.names:
+            imported_name = name.asname.name.value if name.asname else name.name.value
+
+            # Guard: never remove __future__
+            if m.matches(name.name, _FUTURE_ATTR):
+                remaining_names.append(name)
+                continue
+
+            # Guard: keep typing imports if annotations present
+            if self.has_annotations and imported_name == "typing":
+                remaining_names.append(name)
+                continue
+
+            if imported_name not in self.unused_imports:
+                remaining_names.append(name)
+            else:
+                self.changes.append(imported_name)
+
+        return _with_names(stmt, remaining_names)
+
+    def _prune_import_from(self, stmt: cst.ImportFrom) -> cst.ImportFrom | None:
+        """Drop unused names from `from ... import ...` (None if none remain)."""
+        # Guard: never remove __future__
+        if stmt.module and m.matches(stmt.module, _FUTURE_MODULE):
+            return stmt
+
+        if isinstance(stmt.names, cst.ImportStar):
+            return stmt
+
+        remaining_names = []
+        # ImportStar is handled above, so only ImportAlias nodes remain
+        for name in stmt.names:
+            imported_name = name.asname.name.value if name.asname else name.name.value
+
+            # Guard: keep typing.* if annotations present
+            if self.has_annotations and stmt.module and m.matches(stmt.module, _TYPING_MODULE):
+                remaining_names.append(name)
+                continue
+
+            if imported_name not in self.unused_imports:
+                remaining_names.append(name)
+            else:
+                self.changes.append(imported_name)
+
+        return _with_names(stmt, remaining_names)
+
+    # Exact-type lookup for the statement kinds that can be pruned
+    _PRUNERS = {cst.Import: _prune_import, cst.ImportFrom: _prune_import_from}
+
+
+def _with_names(stmt, remaining_names: list):
+    """
+    Rebuild an import statement with the names that survived pruning.
+
+    Args:
+        stmt: Original Import or ImportFrom statement
+        remaining_names: Aliases to keep, in order
+
+    Returns:
+        stmt unchanged, a copy with fewer names, or None if no names remain
+    """
+    if len(remaining_names) == len(stmt.names):
+        return stmt
+    if not remaining_names:
+        return None
+    # The old last alias may have been dropped. Inside parentheses, give
+    # the new last alias its comma (and the layout around it) so multi-line
+    # imports keep their shape; otherwise a trailing comma is illegal, so
+    # let LibCST pick the separator again
+    if getattr(stmt, "lpar", None):
+        last_comma = stmt.names[-1].comma
+    else:
+        last_comma = cst.MaybeSentinel.DEFAULT
+    remaining_names[-1] = remaining_names[-1].with_changes(comma=last_comma)
+    return stmt.with_changes(names=remaining_names)
 
 
 class DeadImportsCodemod:
@@ -137,8 +175,12 @@ class DeadImportsCodemod:
     @staticmethod
     def plan(source_code: str, file_path: str) -> Optional[EditPlan]:
         """Generate edit plan."""
+        # No import statements, nothing to remove
+        if "import" not in source_code:
+            return None
+
         try:
-            tree = cst.parse_module(source_code)
+            tree = parse_module_cached(source_code)
         except cst.ParserSyntaxError as e:
             logger.warning(f"Failed to parse {file_path}: {e}")
             return None
@@ -146,18 +188,14 @@ class DeadImportsCodemod:
         # Check for annotations
         has_annotations = "from __future__ import annotations" in source_code
 
-        # Collect imports and usage (simple analysis)
+        # Collect imports and usage (simple name-based analysis; the
+        # collector needs no scope metadata, so skip MetadataWrapper)
         collector = ImportCollector()
-        try:
-            wrapper = cst.MetadataWrapper(tree)
-            wrapper.visit(collector)
-        except (ValueError, TypeError) as e:
-            # Fallback to simple visitor if metadata fails
-            logger.warning(f"Metadata analysis failed for {file_path}, using fallback: {e}")
-            tree.visit(collector)
+        tree.visit(collector)
 
-        # Find unused imports
-        unused = set(collector.imports.keys()) - collector.used_names
+        # Find unused imports (dict keys views support set difference
+        # directly, without copying the keys into a set first)
+        unused = collector.imports.keys() - collector.used_names
 
         if not unused:
             return None
@@ -172,19 +210,17 @@ class DeadImportsCodemod:
         new_code = modified_tree.code
 
         finding = create_uir(
-            rule_id="PY_DEAD_IMPORTS",
+            file=file_path,
+            line=1,
+            rule="PY_DEAD_IMPORTS",
             severity="low",
             message=f"Remove unused imports ({len(remover.changes)} imports)",
-            file_path=file_path,
-            line=1,
-            snippet="",
-            context={}
         )
 
         edit = Edit(
             file=file_path,
             start_line=1,
-            end_line=len(source_code.split('\n')),
+            end_line=source_code.count("\n") + 1,
             op="replace",
             payload=new_code
         )
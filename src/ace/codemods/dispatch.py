@@ -0,0 +1,91 @@
+"""
+Cached visitor dispatch for codemod transformers.
+
+LibCST looks up ``visit_<Node>``, ``leave_<Node>`` and the per-attribute
+``visit_<Node>_<attr>`` / ``leave_<Node>_<attr>`` hooks with a formatted
+``getattr`` for every node it walks. Its base classes define a no-op stub
+for every one of those names, so every lookup succeeds and every stub is
+called. These bases resolve each hook once per (class, node type), and
+skip the hooks a codemod did not override.
+"""
+
+from collections.abc import Callable
+
+import libcst as cst
+
+
+class _CachedDispatch:
+    """Per-class memo of visitor hooks (None for LibCST's no-op defaults)."""
+
+    _DEFAULTS: type = object
+    _dispatch_cache: dict[tuple[str, type, str | None], Callable | None] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch_cache = {}
+
+    def _resolve(self, prefix: str, node_type: type, attribute: str | None = None) -> Callable | None:
+        """
+        Find the hook overridden for a node type, if any.
+
+        Args:
+            prefix: "visit" or "leave"
+            node_type: CST node class
+            attribute: Child attribute name for attribute hooks
+
+        Returns:
+            Unbound hook function, or None if only the default exists
+        """
+        cache = type(self)._dispatch_cache
+        key = (prefix, node_type, attribute)
+        try:
+            return cache[key]
+        except KeyError:
+            name = f"{prefix}_{node_type.__name__}"
+            if attribute is not None:
+                name = f"{name}_{attribute}"
+            func = getattr(type(self), name, None)
+            if func is getattr(self._DEFAULTS, name, None):
+                func = None
+            cache[key] = func
+            return func
+
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        func = self._resolve("visit", type(node))
+        if func is None:
+            return True
+        # Don't visit children IFF the visit function returned False
+        return func(self, node) is not False
+
+    def on_visit_attribute(self, node: cst.CSTNode, attribute: str) -> None:
+        func = self._resolve("visit", type(node), attribute)
+        if func is not None:
+            func(self, node)
+
+    def on_leave_attribute(self, original_node: cst.CSTNode, attribute: str) -> None:
+        func = self._resolve("leave", type(original_node), attribute)
+        if func is not None:
+            func(self, original_node)
+
+
+class CachedDispatchTransformer(_CachedDispatch, cst.CSTTransformer):
+    """cst.CSTTransformer with memoized hook dispatch."""
+
+    _DEFAULTS = cst.CSTTransformer
+
+    def on_leave(self, original_node, updated_node):
+        func = self._resolve("leave", type(original_node))
+        if func is None:
+            return updated_node
+        return func(self, original_node, updated_node)
+
+
+class CachedDispatchVisitor(_CachedDispatch, cst.CSTVisitor):
+    """cst.CSTVisitor with memoized hook dispatch."""
+
+    _DEFAULTS = cst.CSTVisitor
+
+    def on_leave(self, original_node: cst.CSTNode) -> None:
+        func = self._resolve("leave", type(original_node))
+        if func is not None:
+            func(self, original_node)
@@ -0,0 +1,254 @@
+"""
+Shared LibCST parsing for codemods.
+
+Parsing is the most expensive step of a codemod run, and LibCST trees are
+immutable, so one parsed Module can safely be shared by every codemod
+planned against the same source.
+
+Parsed trees can also be persisted across runs (opt-in): once enabled with
+set_disk_cache_dir(), modules are pickled under <cache_dir>/cst-cache,
+keyed by the SHA-256 of the source (and the LibCST version), so unchanged
+files are unpickled instead of re-parsed. The cache directory usually
+lives inside the repository being edited, so its contents are untrusted:
+every entry carries an HMAC under a per-user key stored outside the
+repository, and entries that don't verify are never unpickled.
+"""
+
+import hashlib
+import hmac
+import os
+import pickle
+import secrets
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import libcst as cst
+
+try:
+    from libcst._version import __version__ as _LIBCST_VERSION
+except ImportError:
+    _LIBCST_VERSION = "unknown"
+
+# Pruning keeps the cache below this size, dropping least recently used
+# entries first
+DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+# ACE cache directory for pickled modules (None = disk cache disabled)
+_disk_cache_dir: Path | None = None
+
+
+def set_disk_cache_dir(cache_dir: str | Path | None) -> None:
+    """
+    Enable or disable the persistent parse cache.
+
+    Args:
+        cache_dir: ACE cache directory (e.g. ".ace"); trees are stored in
+            its cst-cache subdirectory. None disables the disk cache.
+    """
+    global _disk_cache_dir
+    _disk_cache_dir = None if cache_dir is None else Path(cache_dir)
+
+
+def get_disk_cache_dir() -> Path | None:
+    """Return the ACE cache directory the parse cache uses (None if disabled)."""
+    return _disk_cache_dir
+
+
+def _key_path() -> Path:
+    """Location of the per-user signing key (outside any repository)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "ace" / "cst-cache.key"
+
+
+@lru_cache(maxsize=4)
+def _load_signing_key(key_path: Path) -> bytes:
+    """
+    Read the signing key, creating it (mode 0600) on first use.
+
+    Args:
+        key_path: Key file location
+
+    Returns:
+        32-byte secret key
+
+    Raises:
+        OSError: If the key can't be read or created
+    """
+    try:
+        key = key_path.read_bytes()
+        if len(key) == 32:
+            return key
+    except FileNotFoundError:
+        pass
+
+    key_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    key = secrets.token_bytes(32)
+    fd, temp_path = tempfile.mkstemp(dir=key_path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        # mkstemp already creates the file 0600; keep the first key if two
+        # processes race to create one
+        try:
+            os.link(temp_path, key_path)
+        except FileExistsError:
+            key = key_path.read_bytes()
+    finally:
+        os.unlink(temp_path)
+    return key
+
+
+def _signing_key() -> bytes:
+    """Return the current per-user signing key."""
+    return _load_signing_key(_key_path())
+
+
+def _cache_path(cache_dir: Path, source_code: str) -> Path:
+    """Path of the pickle for source_code (sharded by key prefix)."""
+    digest = hashlib.sha256()
+    # Pickles are only valid for the LibCST version that produced them
+    digest.update(_LIBCST_VERSION.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(source_code.encode("utf-8", "surrogatepass"))
+    key = digest.hexdigest()
+    return cache_dir / "cst-cache" / key[:2] / f"{key}.pkl"
+
+
+def _load(path: Path, key: bytes) -> cst.Module | None:
+    """
+    Read a signed entry, unpickling it only if its HMAC verifies.
+
+    Args:
+        path: Entry written by _store()
+        key: Signing key
+
+    Returns:
+        Cached module, or None if missing, unsigned, tampered or corrupt
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+
+    tag, payload = data[:_DIGEST_SIZE], data[_DIGEST_SIZE:]
+    # The path is derived from the source, so bind the tag to it too:
+    # a valid entry can't be copied over the entry for other source
+    expected = hmac.new(key, path.name.encode("ascii") + b"\0" + payload, hashlib.sha256).digest()
+    if not hmac.compare_digest(tag, expected):
+        return None
+
+    try:
+        tree = pickle.loads(payload)
+    except Exception:
+        return None
+    if not isinstance(tree, cst.Module):
+        return None
+
+    # Mark as recently used for pruning
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return tree
+
+
+def _store(path: Path, tree: cst.Module, key: bytes) -> None:
+    """Write a signed, pickled tree via temp file + rename (best-effort, no fsync)."""
+    try:
+        payload = pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+        tag = hmac.new(key, path.name.encode("ascii") + b"\0" + payload, hashlib.sha256).digest()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(tag)
+                f.write(payload)
+            # Concurrent writers race harmlessly: both rename complete files
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except Exception:
+        # A cache that can't be written just means re-parsing next time
+        pass
+
+
+def prune_disk_cache(
+    cache_dir: str | Path | None = None, max_bytes: int = DISK_CACHE_MAX_BYTES
+) -> int:
+    """
+    Delete least recently used entries until the cache fits in max_bytes.
+
+    Args:
+        cache_dir: ACE cache directory (default: the configured one)
+        max_bytes: Size limit for all entries together
+
+    Returns:
+        Number of entries removed
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else _disk_cache_dir
+    if cache_dir is None:
+        return 0
+
+    entries = []
+    total = 0
+    for path in (cache_dir / "cst-cache").glob("*/*.pkl"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime_ns, st.st_size, path))
+        total += st.st_size
+
+    removed = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+@lru_cache(maxsize=64)
+def parse_module_cached(source_code: str) -> cst.Module:
+    """
+    Parse source code into a LibCST Module, reusing recent results.
+
+    Checks the in-process cache first, then the on-disk cache when
+    enabled, and only parses on a miss in both.
+
+    Args:
+        source_code: Python source code
+
+    Returns:
+        Parsed module (shared; never mutate it in place)
+
+    Raises:
+        libcst.ParserSyntaxError: If the source does not parse
+    """
+    cache_dir = _disk_cache_dir
+    if cache_dir is None:
+        return cst.parse_module(source_code)
+
+    try:
+        key = _signing_key()
+    except OSError:
+        # No usable key: never trust entries we can't verify
+        return cst.parse_module(source_code)
+
+    path = _cache_path(cache_dir, source_code)
+    tree = _load(path, key)
+    if tree is not None:
+        return tree
+
+    tree = cst.parse_module(source_code)
+    _store(path, tree, key)
+    return tree
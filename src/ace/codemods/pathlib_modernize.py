@@ -5,16 +5,43 @@ Safely modernizes file path operations to use pathlib.Path.
 Guards: skips dynamic string operations, template strings.
 """
 
+import re
+
 import libcst as cst
 from libcst import matchers as m
 from pathlib import Path
 from typing import Optional
 
+from ace.codemods.dispatch import CachedDispatchTransformer
+from ace.codemods.parsing import parse_module_cached
 from ace.skills.python import EditPlan, Edit
 from ace.uir import UnifiedIssue, create_uir
 
 
-class PathlibModernizeTransformer(cst.CSTTransformer):
+# Every call this codemod rewrites matches this in the source text
+# (whitespace allowed around the dots)
+_OS_PATH_RE = re.compile(
+    r"\bos\s*\.\s*path\s*\.\s*(?:join|exists|isfile|isdir|basename|dirname)\b"
+)
+
+
+# Shared immutable nodes for the rewritten calls
+_PATH_NAME = cst.Name("Path")
+_DIVIDE = cst.Divide()
+
+_OS_PATH_CALL = m.Attribute(
+    value=m.Attribute(value=m.Name("os"), attr=m.Name("path")),
+    attr=m.Name()
+)
+_OS_NAME = m.Name("os")
+_PATHLIB_PATH_ATTR = m.Attribute(value=m.Name("pathlib"), attr=m.Name("Path"))
+_PATHLIB_MODULE = m.Name("pathlib")
+_PATH_ALIAS = m.Name("Path")
+_FUTURE_MODULE = m.Name("__future__")
+_STR_NAME = m.Name("str")
+
+
+class PathlibModernizeTransformer(CachedDispatchTransformer):
     """LibCST transformer to modernize os.path calls to Path."""
 
     def __init__(self):
@@ -27,31 +54,25 @@ class PathlibModernizeTransformer(cst.CSTTransformer):
         """Track imports."""
         for name in node.names:
             if isinstance(name, cst.ImportAlias):
-                if m.matches(name.name, m.Name("os")):
+                if m.matches(name.name, _OS_NAME):
                     self.has_os_import = True
-                elif m.matches(name.name, m.Attribute(value=m.Name("pathlib"), attr=m.Name("Path"))):
+                elif m.matches(name.name, _PATHLIB_PATH_ATTR):
                     self.has_path_import = True
 
     def visit_ImportFrom(self, node: cst.ImportFrom) -> None:
         """Track from imports."""
-        if node.module and m.matches(node.module, m.Name("pathlib")):
+        if node.module and m.matches(node.module, _PATHLIB_MODULE):
             if isinstance(node.names, cst.ImportStar):
                 self.has_path_import = True
             elif not isinstance(node.names, cst.ImportStar):
                 for name in node.names:
-                    if isinstance(name, cst.ImportAlias) and m.matches(name.name, m.Name("Path")):
+                    if isinstance(name, cst.ImportAlias) and m.matches(name.name, _PATH_ALIAS):
                         self.has_path_import = True
 
     def leave_Call(self, original_node: cst.Call, updated_node: cst.Call) -> cst.Call:
         """Transform os.path.join, os.path.exists, etc. to Path equivalents."""
         # Match os.path.join(...)
-        if m.matches(
-            updated_node.func,
-            m.Attribute(
-                value=m.Attribute(value=m.Name("os"), attr=m.Name("path")),
-                attr=m.Name()
-            )
-        ):
+        if m.matches(updated_node.func, _OS_PATH_CALL):
             func_attr = updated_node.func
             method_name = func_attr.attr.value
 
@@ -63,13 +84,13 @@ class PathlibModernizeTransformer(cst.CSTTransformer):
                     if len(updated_node.args) >= 1:
                         # Build Path(first) / second / third ...
                         result = cst.Call(
-                            func=cst.Name("Path"),
+                            func=_PATH_NAME,
                             args=[updated_node.args[0]]
                         )
                         for arg in updated_node.args[1:]:
                             result = cst.BinaryOperation(
                                 left=result,
-                                operator=cst.Divide(),
+                                operator=_DIVIDE,
                                 right=arg.value
                             )
                         self.changes.append(("os.path.join", "Path"))
@@ -82,7 +103,7 @@ class PathlibModernizeTransformer(cst.CSTTransformer):
                         result = cst.Call(
                             func=cst.Attribute(
                                 value=cst.Call(
-                                    func=cst.Name("Path"),
+                                    func=_PATH_NAME,
                                     args=[updated_node.args[0]]
                                 ),
                                 attr=cst.Name("exists")
@@ -99,7 +120,7 @@ class PathlibModernizeTransformer(cst.CSTTransformer):
                         result = cst.Call(
                             func=cst.Attribute(
                                 value=cst.Call(
-                                    func=cst.Name("Path"),
+                                    func=_PATH_NAME,
                                     args=[updated_node.args[0]]
                                 ),
                                 attr=cst.Name("is_file")
@@ -116,7 +137,7 @@ class PathlibModernizeTransformer(cst.CSTTransformer):
                         result = cst.Call(
                             func=cst.Attribute(
                                 value=cst.Call(
-                                    func=cst.Name("Path"),
+                                    func=_PATH_NAME,
                                     args=[updated_node.args[0]]
                                 ),
                                 attr=cst.Name("is_dir")
@@ -132,7 +153,7 @@ class PathlibModernizeTransformer(cst.CSTTransformer):
                     if len(updated_node.args) == 1:
                         result = cst.Attribute(
                             value=cst.Call(
-                                func=cst.Name("Path"),
+                                func=_PATH_NAME,
                                 args=[updated_node.args[0]]
                             ),
                             attr=cst.Name("name")
@@ -146,7 +167,7 @@ class PathlibModernizeTransformer(cst.CSTTransformer):
                     if len(updated_node.args) == 1:
                         result = cst.Attribute(
                             value=cst.Call(
-                                func=cst.Name("Path"),
+                                func=_PATH_NAME,
                                 args=[updated_node.args[0]]
                             ),
                             attr=cst.Name("parent")
@@ -156,33 +177,9 @@ class PathlibModernizeTransformer(cst.CSTTransformer):
 
         return updated_node
 
-    def _is_safe_to_transform(self, node: cst.Call) -> bool:
-        """Check if it's safe to transform this call."""
-        # Guard: Skip if arguments contain complex expressions
-        for arg in node.args:
-            if isinstance(arg.value, cst.FormattedString):
-                # Skip f-strings
-                return False
-            if isinstance(arg.value, cst.Call):
-                # Skip nested calls (too complex)
-                # Allow simple calls like str(x)
-                if not m.matches(arg.value.func, m.Name("str")):
-                    return False
-
-        return True
-
-
-class ImportAdder(cst.CSTTransformer):
-    """Add Path import if needed."""
-
-    def __init__(self, needs_import: bool, has_import: bool):
-        self.needs_import = needs_import
-        self.has_import = has_import
-        self.import_added = False
-
     def leave_Module(self, original_node: cst.Module, updated_node: cst.Module) -> cst.Module:
-        """Add import at the top of the module."""
-        if self.needs_import and not self.has_import and not self.import_added:
+        """Add the Path import once every call has been rewritten."""
+        if self.needs_path_import and not self.has_path_import:
             # Add: from pathlib import Path
             new_import = cst.SimpleStatementLine(
                 body=[
@@ -198,18 +195,32 @@ class ImportAdder(cst.CSTTransformer):
             for stmt in updated_node.body:
                 if isinstance(stmt, cst.SimpleStatementLine):
                     for s in stmt.body:
-                        if isinstance(s, cst.ImportFrom) and s.module and m.matches(s.module, m.Name("__future__")):
+                        if isinstance(s, cst.ImportFrom) and s.module and m.matches(s.module, _FUTURE_MODULE):
                             future_count += 1
                             break
 
             new_body = list(updated_node.body)
             new_body.insert(future_count, new_import)
 
-            self.import_added = True
             return updated_node.with_changes(body=new_body)
 
         return updated_node
 
+    def _is_safe_to_transform(self, node: cst.Call) -> bool:
+        """Check if it's safe to transform this call."""
+        # Guard: Skip if arguments contain complex expressions
+        for arg in node.args:
+            if isinstance(arg.value, cst.FormattedString):
+                # Skip f-strings
+                return False
+            if isinstance(arg.value, cst.Call):
+                # Skip nested calls (too complex)
+                # Allow simple calls like str(x)
+                if not m.matches(arg.value.func, _STR_NAME):
+                    return False
+
+        return True
+
 
 class PathlibModernizeCodemod:
     """Codemod to modernize os.path to pathlib.Path."""
@@ -226,41 +237,39 @@ class PathlibModernizeCodemod:
         Returns:
             EditPlan if changes needed, None otherwise
         """
+        # Cheap text check first: most files never call these os.path helpers
+        if not _OS_PATH_RE.search(source_code):
+            return None
+
         try:
-            tree = cst.parse_module(source_code)
+            tree = parse_module_cached(source_code)
         except Exception:
             return None
 
-        # First pass: transform os.path calls
+        # Single pass: transform os.path calls, then add the import in leave_Module
         transformer = PathlibModernizeTransformer()
         modified_tree = tree.visit(transformer)
 
         if not transformer.changes:
             return None
 
-        # Second pass: add import if needed
-        import_adder = ImportAdder(transformer.needs_path_import, transformer.has_path_import)
-        modified_tree = modified_tree.visit(import_adder)
-
         # Generate edit
         new_code = modified_tree.code
 
         # Create finding
         finding = create_uir(
-            rule_id="PY_PATHLIB",
+            file=file_path,
+            line=1,
+            rule="PY_PATHLIB",
             severity="low",
             message=f"Modernize os.path to pathlib.Path ({len(transformer.changes)} transformations)",
-            file_path=file_path,
-            line=1,
-            snippet="",
-            context={}
         )
 
         # Create edit
         edit = Edit(
             file=file_path,
             start_line=1,
-            end_line=len(source_code.split('\n')),
+            end_line=source_code.count("\n") + 1,
             op="replace",
             payload=new_code
         )
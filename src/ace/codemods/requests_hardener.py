@@ -10,11 +10,16 @@ from libcst import matchers as m
 from pathlib import Path
 from typing import Optional
 
+from ace.codemods.dispatch import CachedDispatchTransformer
+from ace.codemods.parsing import parse_module_cached
 from ace.skills.python import EditPlan, Edit
 from ace.uir import create_uir
 
 
-class RequestsHardenerTransformer(cst.CSTTransformer):
+_REQUESTS_CALL = m.Attribute(value=m.Name("requests"), attr=m.Name())
+
+
+class RequestsHardenerTransformer(CachedDispatchTransformer):
     """LibCST transformer to harden requests calls."""
 
     def __init__(self):
@@ -23,10 +28,7 @@ class RequestsHardenerTransformer(cst.CSTTransformer):
     def leave_Call(self, original_node: cst.Call, updated_node: cst.Call) -> cst.Call:
         """Add timeout parameter to requests.get/post/etc if missing."""
         # Match requests.get(...), requests.post(...), etc.
-        if m.matches(
-            updated_node.func,
-            m.Attribute(value=m.Name("requests"), attr=m.Name())
-        ):
+        if m.matches(updated_node.func, _REQUESTS_CALL):
             method = updated_node.func.attr.value
             if method in ["get", "post", "put", "delete", "patch", "request"]:
                 # Check if timeout already present
@@ -60,8 +62,12 @@ class RequestsHardenerCodemod:
     @staticmethod
     def plan(source_code: str, file_path: str) -> Optional[EditPlan]:
         """Generate edit plan for requests hardening."""
+        # No requests calls, nothing to harden; skip parsing
+        if "requests" not in source_code:
+            return None
+
         try:
-            tree = cst.parse_module(source_code)
+            tree = parse_module_cached(source_code)
         except Exception:
             return None
 
@@ -76,20 +82,18 @@ class RequestsHardenerCodemod:
 
         # Create finding
         finding = create_uir(
-            rule_id="PY_REQUESTS_HARDEN",
+            file=file_path,
+            line=1,
+            rule="PY_REQUESTS_HARDEN",
             severity="medium",
             message=f"Add timeout to requests calls ({len(transformer.changes)} calls)",
-            file_path=file_path,
-            line=1,
-            snippet="",
-            context={}
         )
 
         # Create edit
         edit = Edit(
             file=file_path,
             start_line=1,
-            end_line=len(source_code.split('\n')),
+            end_line=source_code.count("\n") + 1,
             op="replace",
             payload=new_code
         )
@@ -1,6 +1,9 @@
 """ACE configuration management with precedence handling."""
 
+import fnmatch
+import functools
 import os
+import re
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -277,6 +280,17 @@ def should_include_file(file_path: Path | str, config: ACEConfig) -> bool:
     return False
 
 
+@functools.lru_cache(maxsize=256)
+def _pattern_re(pattern: str) -> re.Pattern:
+    """Compile a glob pattern once (same semantics as fnmatch.fnmatch)."""
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
+
+def _fnmatch(name: str, pattern: str) -> bool:
+    """fnmatch.fnmatch using the memoized pattern regex."""
+    return _pattern_re(pattern).match(os.path.normcase(name)) is not None
+
+
 def _matches_pattern(path: str, pattern: str) -> bool:
     """
     Simple glob pattern matching.
@@ -293,21 +307,16 @@ def _matches_pattern(path: str, pattern: str) -> bool:
     Returns:
         True if path matches pattern
     """
-    from fnmatch import fnmatch
-
     # Handle ** recursive patterns
     if "**" in pattern:
         # Convert ** to match any depth
         parts = pattern.split("/")
         if parts[0] == "**":
-            # **/*.py matches any .py file at any depth
+            # **/*.py matches any .py file at any depth: the path itself or
+            # any suffix after a "/" must match. fnmatch's * also matches
+            # "/", so "*/" + remaining covers every suffix in one match.
             remaining = "/".join(parts[1:])
-            return any(
-                fnmatch(path_part, remaining)
-                for path_part in [path] + [
-                    "/".join(path.split("/")[i:]) for i in range(1, len(path.split("/")))
-                ]
-            )
+            return _fnmatch(path, remaining) or _fnmatch(path, "*/" + remaining)
 
     # Simple fnmatch for patterns without **
-    return fnmatch(path, pattern) or fnmatch(path.split("/")[-1], pattern)
+    return _fnmatch(path, pattern) or _fnmatch(path.split("/")[-1], pattern)
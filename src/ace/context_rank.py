@@ -9,12 +9,15 @@ Ranks files based on:
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 import time
 import re
 
 from ace.repomap import RepoMap, Symbol
 
+# Symbol kinds counted towards density (module symbols are not)
+_SYMBOL_KINDS = frozenset(("function", "class"))
+
 
 @dataclass
 class FileScore:
@@ -28,6 +31,41 @@ class FileScore:
     loc: int
 
 
+class _SymbolStats(NamedTuple):
+    """Per-file aggregates gathered in one pass over a file's symbols."""
+    count: int
+    kind_count: int
+    total_size: int
+    max_mtime: int
+    name_matches: int
+
+
+def _summarize_symbols(symbols: list[Symbol], query_lower: Optional[str] = None) -> _SymbolStats:
+    """
+    Aggregate everything the scoring formulas need from a file's symbols.
+
+    Args:
+        symbols: Non-empty list of symbols in one file
+        query_lower: Lowercased query to count symbol name matches for
+
+    Returns:
+        _SymbolStats for the file
+    """
+    kind_count = 0
+    total_size = 0
+    max_mtime = symbols[0].mtime
+    name_matches = 0
+    for s in symbols:
+        if s.type in _SYMBOL_KINDS:
+            kind_count += 1
+        total_size += s.size
+        if s.mtime > max_mtime:
+            max_mtime = s.mtime
+        if query_lower is not None and query_lower in s.name.lower():
+            name_matches += 1
+    return _SymbolStats(len(symbols), kind_count, total_size, max_mtime, name_matches)
+
+
 class ContextRanker:
     """
     Context ranking engine for code files.
@@ -45,7 +83,11 @@ class ContextRanker:
             current_time: Fixed timestamp for deterministic ranking (defaults to current time)
         """
         self.repo_map = repo_map
-        self._file_cache: dict[str, FileScore] = {}
+        # (file, query, weights...) -> score; None caches filtered files too
+        self._file_cache: dict[tuple, Optional[FileScore]] = {}
+        # Symbol list the cache was filled from (RepoMap.build() replaces it)
+        self._cached_symbols: object = None
+        self._cached_symbol_count = 0
         # Store timestamp for deterministic ranking; use current time if not provided
         self._current_time = current_time if current_time is not None else int(time.time())
 
@@ -92,6 +134,21 @@ class ContextRanker:
 
         return scores[:limit]
 
+    def clear_cache(self) -> None:
+        """
+        Forget memoized file scores.
+
+        Rebuilding the repo map is detected automatically; call this after
+        changing repo_map.symbols in place some other way.
+        """
+        self._file_cache.clear()
+        self._cached_symbols, self._cached_symbol_count = self._symbols_state()
+
+    def _symbols_state(self) -> tuple[object, int]:
+        """The repo map's symbol list and its length (for staleness checks)."""
+        symbols = getattr(self.repo_map, "symbols", None)
+        return symbols, len(symbols) if isinstance(symbols, list) else 0
+
     def _score_file(
         self,
         file: str,
@@ -101,7 +158,7 @@ class ContextRanker:
         relevance_weight: float = 2.0
     ) -> Optional[FileScore]:
         """
-        Calculate score for a single file.
+        Calculate score for a single file (memoized per ranker).
 
         Args:
             file: File path
@@ -111,17 +168,50 @@ class ContextRanker:
             relevance_weight: Weight for relevance
 
         Returns:
-            FileScore or None if file should be filtered
+            FileScore (shared between calls; don't mutate it) or None if
+            file should be filtered
         """
+        # Drop scores computed from a previous build of the repo map
+        symbols, count = self._symbols_state()
+        if symbols is not self._cached_symbols or count != self._cached_symbol_count:
+            self.clear_cache()
+
+        key = (file, query, recency_weight, density_weight, relevance_weight)
+        try:
+            return self._file_cache[key]
+        except KeyError:
+            pass
+
+        file_score = self._compute_file_score(
+            file, query, recency_weight, density_weight, relevance_weight
+        )
+        self._file_cache[key] = file_score
+        return file_score
+
+    def _compute_file_score(
+        self,
+        file: str,
+        query: Optional[str],
+        recency_weight: float,
+        density_weight: float,
+        relevance_weight: float
+    ) -> Optional[FileScore]:
+        """Score a single file from its symbols (uncached _score_file)."""
         # Get file symbols
         symbols = self.repo_map.get_file_symbols(file)
         if not symbols:
             return None
 
+        # One pass over the symbols feeds every component
+        query_lower = query.lower() if query else None
+        stats = _summarize_symbols(symbols, query_lower)
+
         # Calculate components
-        symbol_density = self._calculate_symbol_density(symbols)
-        recency_boost = self._calculate_recency_boost(symbols)
-        relevance_score = self._calculate_relevance(file, symbols, query) if query else 1.0
+        symbol_density = self._density_from_stats(stats)
+        recency_boost = self._recency_from_mtime(stats.max_mtime)
+        relevance_score = (
+            self._relevance_score(file, query_lower, stats.name_matches) if query else 1.0
+        )
 
         # If query is provided and relevance is 0, filter out
         if query and relevance_score == 0:
@@ -134,11 +224,8 @@ class ContextRanker:
             relevance_weight * relevance_score
         )
 
-        # Count non-module symbols
-        symbol_count = sum(1 for s in symbols if s.type in ["function", "class"])
-
         # Estimate LOC (use file size as proxy: ~50 bytes per line average)
-        avg_size = sum(s.size for s in symbols) / len(symbols) if symbols else 0
+        avg_size = stats.total_size / stats.count
         loc = int(avg_size / 50) if avg_size > 0 else 1
 
         return FileScore(
@@ -147,7 +234,7 @@ class ContextRanker:
             symbol_density=symbol_density,
             recency_boost=recency_boost,
             relevance_score=relevance_score,
-            symbol_count=symbol_count,
+            symbol_count=stats.kind_count,
             loc=loc
         )
 
@@ -161,14 +248,20 @@ class ContextRanker:
         Returns:
             Symbol density score
         """
+        if not symbols:
+            return 0.0
+        return self._density_from_stats(_summarize_symbols(symbols))
+
+    def _density_from_stats(self, stats: _SymbolStats) -> float:
+        """Symbol density from pre-aggregated symbol stats."""
         # Count functions and classes
-        symbol_count = sum(1 for s in symbols if s.type in ["function", "class"])
+        symbol_count = stats.kind_count
 
         if symbol_count == 0:
             return 0.0
 
         # Estimate LOC from file size (average ~50 bytes per line)
-        avg_size = sum(s.size for s in symbols) / len(symbols) if symbols else 0
+        avg_size = stats.total_size / stats.count
         kloc = (avg_size / 50) / 1000 if avg_size > 0 else 0.001
 
         # Density = symbols per KLOC
@@ -195,7 +288,10 @@ class ContextRanker:
             return 1.0
 
         # Get most recent mtime
-        max_mtime = max(s.mtime for s in symbols)
+        return self._recency_from_mtime(max(s.mtime for s in symbols))
+
+    def _recency_from_mtime(self, max_mtime: int) -> float:
+        """Recency boost for a file whose newest symbol has max_mtime."""
         # Use stored timestamp for deterministic ranking
         current_time = self._current_time
 
@@ -229,18 +325,17 @@ class ContextRanker:
             return 1.0
 
         query_lower = query.lower()
+        symbol_matches = sum(1 for symbol in symbols if query_lower in symbol.name.lower())
+        return self._relevance_score(file, query_lower, symbol_matches)
+
+    def _relevance_score(self, file: str, query_lower: str, symbol_matches: int) -> float:
+        """Relevance score given the number of symbol names matching the query."""
         score = 0.0
 
         # File path match (weight: 0.3)
         if query_lower in file.lower():
             score += 0.3
 
-        # Symbol name matches
-        symbol_matches = 0
-        for symbol in symbols:
-            if query_lower in symbol.name.lower():
-                symbol_matches += 1
-
         # Symbol match score (weight: 0.7)
         if symbol_matches > 0:
             # Normalize by number of symbols (cap at 10 matches)
@@ -302,15 +397,16 @@ class ContextRanker:
             similarity = symbol_overlap * 0.7 + dep_overlap * 0.3
 
             if similarity > 0:
+                stats = _summarize_symbols(other_symbols)
                 # Create FileScore with similarity as score
                 file_score = FileScore(
                     file=other_file,
                     score=similarity,
-                    symbol_density=self._calculate_symbol_density(other_symbols),
-                    recency_boost=self._calculate_recency_boost(other_symbols),
+                    symbol_density=self._density_from_stats(stats),
+                    recency_boost=self._recency_from_mtime(stats.max_mtime),
                     relevance_score=similarity,
-                    symbol_count=sum(1 for s in other_symbols if s.type in ["function", "class"]),
-                    loc=int(sum(s.size for s in other_symbols) / 50) if other_symbols else 1
+                    symbol_count=stats.kind_count,
+                    loc=int(stats.total_size / 50)
                 )
                 scores.append(file_score)
 
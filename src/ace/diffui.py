@@ -6,6 +6,7 @@ on a per-file basis using rich for terminal UI.
 """
 
 import sys
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -317,7 +318,7 @@ def _display_full_diff_plain(patch: FilePatch) -> None:
 
 def apply_approved_changes(
     changes: dict[str, str],
-    approved: set[str],
+    approved: Iterable[str],
     dry_run: bool = False
 ) -> dict[str, bool]:
     """
@@ -325,7 +326,7 @@ def apply_approved_changes(
 
     Args:
         changes: Dictionary mapping file paths to new content
-        approved: Set of approved file paths
+        approved: Approved file paths (a set, or changes.keys() to apply all)
         dry_run: If True, don't actually write files
 
     Returns:
@@ -7,11 +7,31 @@ analysis by skipping unchanged files.
 
 import hashlib
 import json
+import os
+import stat
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
+from ace.jsonio import dumps_pretty
 from ace.safety import atomic_write
 
+# Common binary extensions excluded from the index
+BINARY_EXTS = frozenset({
+    ".pyc", ".pyo", ".so", ".dylib", ".dll",
+    ".exe", ".bin", ".jpg", ".jpeg", ".png", ".gif",
+    ".pdf", ".zip", ".tar", ".gz", ".bz2"
+})
+
+# Directories never worth descending into when walking a tree
+SKIP_DIRS = frozenset({".git", ".ace", "node_modules", "__pycache__"})
+
+MAX_INDEXABLE_SIZE = 10 * 1024 * 1024  # 10 MB
+
+# Larger files are skipped by analysis (mostly generated or binary)
+MAX_ANALYZE_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
+
 
 @dataclass
 class FileEntry:
@@ -72,7 +92,7 @@ class ContentIndex:
             }
 
         # Write with deterministic formatting and atomic write for durability
-        content = json.dumps(data, indent=2, sort_keys=True).encode('utf-8')
+        content = dumps_pretty(data, sort_keys=True)
         content += b"\n"  # Trailing newline
         atomic_write(self.index_path, content)
 
@@ -92,34 +112,44 @@ class ContentIndex:
         Raises:
             OSError: If file cannot be read
         """
-        # Read file and compute hash
-        content = file_path.read_bytes()
-        sha256 = hashlib.sha256(content).hexdigest()
-
-        # Get file stats
-        stat = file_path.stat()
+        entry = _build_entry(file_path)
 
         # Get existing clean_runs_count if preserving
-        clean_runs = 0
-        if preserve_clean_runs:
-            path_str = str(file_path)
-            if path_str in self.entries:
-                clean_runs = self.entries[path_str].clean_runs_count
-
-        # Create entry
-        entry = FileEntry(
-            path=str(file_path),
-            size=stat.st_size,
-            mtime=stat.st_mtime,
-            sha256=sha256,
-            clean_runs_count=clean_runs
-        )
+        if preserve_clean_runs and entry.path in self.entries:
+            entry.clean_runs_count = self.entries[entry.path].clean_runs_count
 
         # Store in index
-        self.entries[str(file_path)] = entry
+        self.entries[entry.path] = entry
 
         return entry
 
+    def add_files(self, file_paths: Iterable[Path], jobs: int = 4) -> list[FileEntry]:
+        """
+        Add or update several files in one batch.
+
+        Hashing runs on a thread pool (hashlib releases the GIL for large
+        buffers); entries are merged into the index on the calling thread.
+        Files that cannot be read are skipped. Call save() once afterwards.
+
+        Args:
+            file_paths: Paths of files to index
+            jobs: Number of hashing workers (default: 4)
+
+        Returns:
+            FileEntry list for the files that were indexed
+        """
+        paths = list(file_paths)
+        if jobs > 1 and len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(_try_build_entry, paths))
+        else:
+            results = [_try_build_entry(p) for p in paths]
+
+        entries = [entry for entry in results if entry is not None]
+        for entry in entries:
+            self.entries[entry.path] = entry
+        return entries
+
     def has_changed(self, file_path: Path) -> bool:
         """
         Check if file has changed since last index.
@@ -262,6 +292,26 @@ class ContentIndex:
         return entry.clean_runs_count >= threshold
 
 
+def _build_entry(file_path: Path) -> FileEntry:
+    """Read, hash and stat a file into a fresh FileEntry (raises OSError)."""
+    content = file_path.read_bytes()
+    stat = file_path.stat()
+    return FileEntry(
+        path=str(file_path),
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        sha256=hashlib.sha256(content).hexdigest(),
+    )
+
+
+def _try_build_entry(file_path: Path) -> FileEntry | None:
+    """Like _build_entry, but return None for files that can't be read."""
+    try:
+        return _build_entry(file_path)
+    except OSError:
+        return None
+
+
 def compute_file_hash(file_path: Path) -> str:
     """
     Compute SHA256 hash of file content.
@@ -315,25 +365,64 @@ def is_indexable(file_path: Path) -> bool:
         return False
 
     # Exclude common binary extensions
-    binary_exts = {
-        ".pyc", ".pyo", ".so", ".dylib", ".dll",
-        ".exe", ".bin", ".jpg", ".jpeg", ".png", ".gif",
-        ".pdf", ".zip", ".tar", ".gz", ".bz2"
-    }
-    if file_path.suffix.lower() in binary_exts:
+    if file_path.suffix.lower() in BINARY_EXTS:
         return False
 
     # Exclude very large files (>10MB) - only check if file exists
-    if file_path.exists():
-        try:
-            if file_path.stat().st_size > 10 * 1024 * 1024:
-                return False
-        except OSError:
+    try:
+        if file_path.stat().st_size > MAX_INDEXABLE_SIZE:
             return False
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return False
 
     return True
 
 
+def walk_indexable(root: str | os.PathLike[str]) -> Iterator[str]:
+    """
+    Yield paths of indexable files under root using os.scandir.
+
+    Applies the same rules as is_indexable() but works on DirEntry objects,
+    so file-type checks come from readdir and no Path objects are built.
+    Directories in SKIP_DIRS are pruned before descending. Order is not
+    guaranteed; sort the result if determinism is needed.
+
+    Args:
+        root: Directory to walk
+
+    Yields:
+        File paths as strings
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            # Ignore unreadable directories
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    if name.startswith("."):
+                        continue
+                    if os.path.splitext(name)[1].lower() in BINARY_EXTS:
+                        continue
+                    if entry.stat(follow_symlinks=False).st_size > MAX_INDEXABLE_SIZE:
+                        continue
+                except OSError:
+                    continue
+                yield entry.path
+
+
 def warmup_index(target: Path) -> dict[str, int]:
     """
     Build or rebuild content index for a target path.
@@ -388,3 +477,50 @@ def warmup_index(target: Path) -> dict[str, int]:
     index.save()
 
     return stats
+
+
+def collect_analysis_files(
+    target_path: Path, only_files: Iterable[str | os.PathLike[str]] | None = None
+) -> list[Path]:
+    """
+    List the files an analysis run over target_path reads, in path order.
+
+    This is the file set run_analyze() uses; caches that must notice any
+    change to an analysis input should be keyed on exactly this set.
+
+    Args:
+        target_path: Directory or file to analyze
+        only_files: Analyze only these files instead of walking target_path
+
+    Returns:
+        Regular, indexable files no larger than MAX_ANALYZE_FILE_SIZE,
+        sorted by path string
+    """
+    if only_files is not None:
+        # Caller already knows which files to analyze: skip the directory walk
+        files = []
+        for f in sorted((Path(f) for f in only_files), key=str):
+            try:
+                st = f.stat()
+            except OSError:
+                # Skip files that vanished or can't be stat'ed
+                continue
+            if stat.S_ISREG(st.st_mode) and st.st_size <= MAX_ANALYZE_FILE_SIZE:
+                files.append(f)
+        return files
+
+    if target_path.is_file():
+        return [target_path]
+
+    # Sorted by path string so findings come out in (file, line, rule) order
+    files = []
+    for f in sorted(target_path.rglob("*"), key=str):
+        # One stat answers both "regular file?" and "too large?"
+        try:
+            st = f.stat()
+        except OSError:
+            # Skip files we can't stat
+            continue
+        if stat.S_ISREG(st.st_mode) and st.st_size <= MAX_ANALYZE_FILE_SIZE and is_indexable(f):
+            files.append(f)
+    return files
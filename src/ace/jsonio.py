@@ -0,0 +1,120 @@
+"""
+JSON serialization helpers that use orjson when it is installed.
+
+Output is byte-identical to json.dumps whichever backend is installed, so
+persisted files (baselines, indexes) don't change with the installed extras
+and stdout stays ASCII. orjson is used as a fast path only when its bytes
+already match; output that would differ is re-serialized with json.dumps.
+"""
+
+import json
+import re
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson writes exponent floats as "1e16" / "1e-7" where json.dumps writes
+# "1e+16" / "1e-07". The pattern starts with a literal so re can skip ahead
+# quickly; a false positive in text only costs a json.dumps fallback
+_EXPONENT = re.compile(rb"e-?\d+(?:[,\s\]}]|$)")
+
+
+def _dumps_orjson(obj: Any, option: int, default: Callable[[Any], Any] | None) -> bytes | None:
+    """
+    Serialize obj with orjson if the result matches json.dumps byte for byte.
+
+    Args:
+        obj: JSON-serializable object
+        option: orjson option flags
+        default: Called for objects that are not natively serializable
+
+    Returns:
+        orjson output, or None if json.dumps must produce the bytes instead
+    """
+    # Dataclasses and datetimes go through default like they would with
+    # json.dumps
+    option |= orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+    try:
+        out = orjson.dumps(obj, default=default, option=option)
+    except orjson.JSONEncodeError:
+        # Non-string keys, integers beyond 64 bits, ...: json.dumps handles
+        # these (or raises its own error)
+        return None
+    # json.dumps \u-escapes non-ASCII text and DEL, and writes floats in
+    # [1e-5, 1e-4) in exponent form ("1e-05", not "0.00001")
+    if not out.isascii() or b"\x7f" in out or b"0.0000" in out or _EXPONENT.search(out):
+        return None
+    return out
+
+
+def dumps_pretty(
+    obj: Any,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """
+    Serialize obj like json.dumps(obj, indent=2) and encode it as UTF-8.
+
+    With orjson installed, serialization and key sorting happen in Rust.
+    The bytes are the same either way, except that NaN and infinities
+    (not valid JSON) become null with orjson.
+
+    Args:
+        obj: JSON-serializable object
+        sort_keys: Sort object keys (default: False)
+        default: Called for objects that are not natively serializable
+
+    Returns:
+        Indented JSON as UTF-8 bytes (no trailing newline)
+
+    Examples:
+        >>> dumps_pretty({"b": 1, "a": [1, 2]}, sort_keys=True).decode()
+        '{\\n  "a": [\\n    1,\\n    2\\n  ],\\n  "b": 1\\n}'
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        out = _dumps_orjson(obj, option, default)
+        if out is not None:
+            return out
+    return json.dumps(obj, indent=2, sort_keys=sort_keys, default=default).encode("utf-8")
+
+
+def dumps_compact(
+    obj: Any,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """
+    Serialize obj as single-line JSON without whitespace, encoded as UTF-8.
+
+    Suitable for JSON Lines output: the result never contains a newline.
+    Matches json.dumps(obj, separators=(",", ":")) like dumps_pretty().
+
+    Args:
+        obj: JSON-serializable object
+        sort_keys: Sort object keys (default: False)
+        default: Called for objects that are not natively serializable
+
+    Returns:
+        Compact JSON as UTF-8 bytes (no trailing newline)
+
+    Examples:
+        >>> dumps_compact({"b": 1, "a": [1, 2]}, sort_keys=True).decode()
+        '{"a":[1,2],"b":1}'
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        out = _dumps_orjson(obj, option, default)
+        if out is not None:
+            return out
+    return json.dumps(
+        obj, separators=(",", ":"), sort_keys=sort_keys, default=default
+    ).encode("utf-8")
@@ -4,7 +4,8 @@ import hashlib
 import sys
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -14,7 +15,7 @@ from ace.errors import ExitCode
 from ace.fileio import read_text_file, write_text_preserving_style
 from ace.git_safety import check_git_safety, git_commit_changes, git_stash_changes
 from ace.guard import guard_python_edit
-from ace.index import ContentIndex, is_indexable
+from ace.index import ContentIndex, collect_analysis_files
 from ace.journal import Journal
 from ace.perf import get_profiler
 from ace.receipts import Receipt, create_receipt
@@ -58,6 +59,11 @@ from ace.telemetry import Telemetry as TelemetryTracker  # For explicit tracking
 from ace.uir import UnifiedIssue
 
 
+def _finding_order(finding: UnifiedIssue) -> tuple[int, str]:
+    """Sort key for findings within one file (files are visited in path order)."""
+    return (finding.line, finding.rule)
+
+
 def run_analyze(
     target_path: Path | str,
     rules: list[str] | None = None,
@@ -68,10 +74,52 @@ def run_analyze(
     incremental: bool = False,
     rebuild_index: bool = False,
     deep: bool = False,
+    only_files: list[Path] | None = None,
 ) -> list[UnifiedIssue]:
     """
     Run analysis on target path and collect findings.
 
+    Materializing wrapper around iter_analyze(); see it for arguments.
+
+    Returns:
+        List of UnifiedIssue findings (sorted deterministically)
+    """
+    return list(
+        iter_analyze(
+            target_path,
+            rules,
+            use_cache=use_cache,
+            cache_ttl=cache_ttl,
+            cache_dir=cache_dir,
+            jobs=jobs,
+            incremental=incremental,
+            rebuild_index=rebuild_index,
+            deep=deep,
+            only_files=only_files,
+        )
+    )
+
+
+def iter_analyze(
+    target_path: Path | str,
+    rules: list[str] | None = None,
+    use_cache: bool = True,
+    cache_ttl: int = 3600,
+    cache_dir: str = ".ace",
+    jobs: int = 1,
+    incremental: bool = False,
+    rebuild_index: bool = False,
+    deep: bool = False,
+    only_files: list[Path] | None = None,
+) -> Iterator[UnifiedIssue]:
+    """
+    Run analysis on target path and yield findings file by file.
+
+    Findings are yielded in the same deterministic (file, line, rule) order
+    run_analyze() returns, so callers can stream output without holding the
+    whole result set. The content index (incremental mode) is only updated
+    once the generator is fully consumed.
+
     Args:
         target_path: Directory or file to analyze (Path or str)
         rules: Optional list of rule IDs to run (None = all rules)
@@ -82,9 +130,11 @@ def run_analyze(
         incremental: Only analyze changed files using content index
         rebuild_index: Rebuild content index before analyzing
         deep: Disable clean-skip heuristic (always run all rules, default: False)
+        only_files: Analyze only these files instead of walking target_path
+            (used by watch mode to re-check changed files only)
 
-    Returns:
-        List of UnifiedIssue findings (sorted deterministically)
+    Yields:
+        UnifiedIssue findings (sorted deterministically)
     """
     profiler = get_profiler()
     profiler.start_phase("analyze")
@@ -144,6 +194,8 @@ def run_analyze(
                 if cached_findings is not None:
                     # Cache hit: restore UnifiedIssue objects from dicts
                     findings = [_dict_to_uir(finding_dict) for finding_dict in cached_findings]
+                    # Entries written by older versions may not be sorted
+                    findings.sort(key=_finding_order)
                     return (file_index, findings)
 
             # Cache miss: perform analysis
@@ -219,6 +271,9 @@ def run_analyze(
             # Filter out suppressed findings
             file_findings = filter_findings_by_suppressions(file_findings, suppressions)
 
+            # Order within the file; files themselves are visited in path order
+            file_findings.sort(key=_finding_order)
+
             # Store in cache (as dicts for deterministic serialization)
             if cache and file_findings:
                 cache.set(
@@ -235,24 +290,7 @@ def run_analyze(
             return (file_index, [])
 
     # Collect files to analyze
-    MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
-
-    if target_path.is_file():
-        files = [target_path]
-    else:
-        # Collect all files (sorted for determinism)
-        files = sorted(target_path.rglob("*"))
-        # Filter: must be file, indexable, and not too large (skip binaries >5MB)
-        filtered_files = []
-        for f in files:
-            if f.is_file() and is_indexable(f):
-                try:
-                    if f.stat().st_size <= MAX_FILE_SIZE:
-                        filtered_files.append(f)
-                except Exception:
-                    # Skip files we can't stat
-                    pass
-        files = filtered_files
+    files = collect_analysis_files(target_path, only_files)
 
     # Apply incremental filtering if requested
     if incremental or rebuild_index:
@@ -271,48 +309,24 @@ def run_analyze(
         # Update index with analyzed files (will be saved after analysis)
         # This ensures index stays in sync even if analysis is interrupted
 
-    # Analyze files (parallel or sequential)
-    indexed_results: list[tuple[int, list[UnifiedIssue]]] = []
-
+    # Analyze files (parallel or sequential), yielding in file order
     if jobs > 1:
-        # Parallel execution with ThreadPoolExecutor
+        # Parallel execution with ThreadPoolExecutor; map() preserves order
         with ThreadPoolExecutor(max_workers=jobs) as executor:
-            futures = {
-                executor.submit(analyze_file, file_path, idx): idx
-                for idx, file_path in enumerate(files)
-            }
-
-            for future in as_completed(futures):
-                file_index, findings = future.result()
-                if findings:
-                    indexed_results.append((file_index, findings))
+            for _, findings in executor.map(analyze_file, files, range(len(files))):
+                yield from findings
     else:
         # Sequential execution
         for idx, file_path in enumerate(files):
-            file_index, findings = analyze_file(file_path, idx)
-            if findings:
-                indexed_results.append((file_index, findings))
-
-    # Sort by original file index for determinism, then extract findings
-    indexed_results.sort(key=lambda x: x[0])
-    all_findings = []
-    for _, findings in indexed_results:
-        all_findings.extend(findings)
-
-    # Final sort by (file, line, rule) for complete determinism
-    all_findings.sort(key=lambda f: (f.file, f.line, f.rule))
+            _, findings = analyze_file(file_path, idx)
+            yield from findings
 
     # Update index if incremental mode was used
     if incremental or rebuild_index:
-        for file_path in files:
-            try:
-                index.add_file(file_path)
-            except Exception:
-                pass  # Skip files that can't be indexed
+        index.add_files(files)
         index.save()
 
     profiler.stop_phase("analyze")
-    return all_findings
 
 
 def should_run_rule_static(rule_id: str, rules_filter: set[str] | None) -> bool:
@@ -324,21 +338,13 @@ def should_run_rule_static(rule_id: str, rules_filter: set[str] | None) -> bool:
 
 def _dict_to_uir(finding_dict: dict) -> UnifiedIssue:
     """Convert finding dict back to UnifiedIssue."""
-    from ace.uir import Severity
-
-    return UnifiedIssue(
-        file=finding_dict["file"],
-        line=finding_dict["line"],
-        rule=finding_dict["rule"],
-        severity=Severity(finding_dict["severity"]),
-        message=finding_dict["message"],
-        suggestion=finding_dict.get("suggestion", ""),
-        snippet=finding_dict.get("snippet", ""),
-    )
+    return UnifiedIssue.from_dict(finding_dict)
 
 
 def run_refactor(
-    target_path: Path, rules: list[str] | None = None
+    target_path: Path,
+    rules: list[str] | None = None,
+    findings: list[UnifiedIssue] | None = None,
 ) -> list[EditPlan]:
     """
     Generate refactoring plans for findings.
@@ -346,12 +352,15 @@ def run_refactor(
     Args:
         target_path: Directory or file to refactor
         rules: Optional list of rule IDs to apply (None = all refactorable rules)
+        findings: Findings from a prior run_analyze(target_path, rules) call
+            (None = analyze now)
 
     Returns:
         List of EditPlan objects
     """
     # First, run analysis to get findings
-    findings = run_analyze(target_path, rules)
+    if findings is None:
+        findings = run_analyze(target_path, rules)
 
     # Group findings by file and rule
     file_rule_findings = {}
@@ -12,11 +12,15 @@ Cache: .ace/llm_cache.json by content fingerprint.
 import hashlib
 import json
 import os
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+# Hunk headers ("@@ -12,3 +12,4 @@") shift whenever unrelated lines move
+_HUNK_HEADER_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@", re.MULTILINE)
+
 
 @dataclass
 class LLMResponse:
@@ -155,19 +159,22 @@ class LLMAssist:
         # Default to null provider (heuristics only)
         return NullProvider()
 
-    def _call_with_budget(self, prompt: str, max_tokens: int = 100) -> LLMResponse:
+    def _call_with_budget(
+        self, prompt: str, max_tokens: int = 100, cache_key: str | None = None
+    ) -> LLMResponse:
         """
         Call LLM with budget enforcement and caching.
 
         Args:
             prompt: Input prompt
             max_tokens: Maximum tokens
+            cache_key: Text to fingerprint instead of the prompt (default: prompt)
 
         Returns:
             LLMResponse with text, cached flag, and provider name
         """
         # Check cache first
-        fingerprint = LLMCache.fingerprint(prompt)
+        fingerprint = LLMCache.fingerprint(prompt if cache_key is None else cache_key)
         cached_result = self.cache.get(fingerprint)
         if cached_result:
             return LLMResponse(text=cached_result, cached=True, provider=type(self.provider).__name__)
@@ -255,7 +262,10 @@ class LLMAssist:
 
         prompt = f"Summarize this diff in one line for a commit message:\n\n{diff_truncated}\n\nCommit message:"
 
-        response = self._call_with_budget(prompt, max_tokens=50)
+        # Key the cache on the diff without hunk line numbers so the same
+        # change reuses its summary after unrelated edits shift it
+        cache_key = _HUNK_HEADER_RE.sub("@@", prompt)
+        response = self._call_with_budget(prompt, max_tokens=50, cache_key=cache_key)
 
         if response.text:
             # Clean up response
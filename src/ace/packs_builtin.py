@@ -4,10 +4,13 @@ Built-in Codemod Packs for ACE v1.6.
 Defines standard codemod packs that can be applied via CLI.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Callable, Optional, List
 
+from ace.codemods.parsing import get_disk_cache_dir, set_disk_cache_dir
 from ace.skills.python import EditPlan
 
 
@@ -120,7 +123,18 @@ def apply_pack_to_file(pack_id: str, file_path: str, source_code: str) -> Option
     return pack.codemod_func(source_code, file_path)
 
 
-def apply_pack_to_directory(pack_id: str, directory: Path, pattern: str = "**/*.py") -> List[EditPlan]:
+def _plan_file(pack_id: str, file_path: Path) -> Optional[EditPlan]:
+    """Read one file and plan a pack for it (None if unchanged or unreadable)."""
+    try:
+        source_code = file_path.read_text(encoding='utf-8')
+        return apply_pack_to_file(pack_id, str(file_path), source_code)
+    except Exception:
+        return None
+
+
+def apply_pack_to_directory(
+    pack_id: str, directory: Path, pattern: str = "**/*.py", jobs: int = 1
+) -> List[EditPlan]:
     """
     Apply a codemod pack to all matching files in a directory.
 
@@ -128,20 +142,25 @@ def apply_pack_to_directory(pack_id: str, directory: Path, pattern: str = "**/*.
         pack_id: Pack ID
         directory: Directory to scan
         pattern: Glob pattern for files
+        jobs: Number of worker processes (default: 1 for sequential)
 
     Returns:
         List of EditPlans
     """
-    plans = []
-
-    for file_path in directory.glob(pattern):
-        if file_path.is_file():
-            try:
-                source_code = file_path.read_text(encoding='utf-8')
-                plan = apply_pack_to_file(pack_id, str(file_path), source_code)
-                if plan:
-                    plans.append(plan)
-            except Exception:
-                continue
-
-    return plans
+    files = [f for f in directory.glob(pattern) if f.is_file()]
+    plan_file = partial(_plan_file, pack_id)
+
+    if jobs > 1 and len(files) > 1:
+        # LibCST transforms are pure Python and hold the GIL, so use
+        # processes; only paths and EditPlans cross the process boundary.
+        # Workers share this process's on-disk parse cache setting.
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=set_disk_cache_dir,
+            initargs=(get_disk_cache_dir(),),
+        ) as executor:
+            results = list(executor.map(plan_file, files, chunksize=8))
+    else:
+        results = map(plan_file, files)
+
+    return [plan for plan in results if plan]
@@ -11,6 +11,7 @@ from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Literal, Optional
 
+from ace.jsonio import dumps_pretty
 from ace.safety import atomic_write
 
 
@@ -180,7 +181,7 @@ class RepoMap:
         }
 
         # Write with sorted keys for determinism and atomic write for durability
-        content = json.dumps(data, indent=2, sort_keys=True).encode('utf-8')
+        content = dumps_pretty(data, sort_keys=True)
         atomic_write(path, content)
 
     @classmethod
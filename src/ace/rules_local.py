@@ -121,7 +121,7 @@ RULES_CATALOG = [
 ]
 
 
-def bump_rules_version(rules_path: Path = Path(".ace/rules.json")) -> None:
+def bump_rules_version(rules_path: Path = Path(".ace/rules.json")) -> str:
     """
     Bump local rules version and rewrite rules.json deterministically.
 
@@ -132,6 +132,9 @@ def bump_rules_version(rules_path: Path = Path(".ace/rules.json")) -> None:
 
     Args:
         rules_path: Path to rules.json file
+
+    Returns:
+        Version written to rules.json
     """
     # Ensure .ace directory exists
     rules_path.parent.mkdir(parents=True, exist_ok=True)
@@ -157,6 +160,8 @@ def bump_rules_version(rules_path: Path = Path(".ace/rules.json")) -> None:
         json.dump(rules_doc, f, indent=2, sort_keys=True)
         f.write("\n")  # Trailing newline
 
+    return rules_doc["version"]
+
 
 def load_rules(rules_path: Path = Path(".ace/rules.json")) -> dict:
     """
@@ -195,12 +200,16 @@ def get_rules_version(rules_path: Path = Path(".ace/rules.json")) -> str:
         return "unknown"
 
 
-def init_rules(rules_path: Path = Path(".ace/rules.json")) -> None:
+def init_rules(rules_path: Path = Path(".ace/rules.json")) -> str:
     """
     Initialize rules.json if it doesn't exist.
 
     Args:
         rules_path: Path to rules.json file
+
+    Returns:
+        Current rules version
     """
     if not rules_path.exists():
-        bump_rules_version(rules_path)
+        return bump_rules_version(rules_path)
+    return get_rules_version(rules_path)
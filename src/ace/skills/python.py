@@ -58,7 +58,7 @@ class EditPlan:
 # ============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class Finding:
     """Legacy Finding class for Sprint 3 HTTP timeout rule."""
 
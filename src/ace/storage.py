@@ -7,6 +7,10 @@ import time
 from pathlib import Path
 from typing import Any
 
+from ace import __version__
+from ace.index import collect_analysis_files
+from ace.jsonio import dumps_pretty
+
 
 class AnalysisCache:
     """
@@ -216,34 +220,42 @@ def save_baseline(findings: list[dict[str, Any]], output_path: str | Path) -> bo
     ]
 
     # Write deterministic JSON
-    with open(output_path, "w", encoding="utf-8") as fp:
-        json.dump(baseline_entries, fp, indent=2, sort_keys=True)
-        fp.write("\n")  # Trailing newline
+    output_path.write_bytes(dumps_pretty(baseline_entries, sort_keys=True) + b"\n")
 
     return True
 
 
-def load_baseline(baseline_path: str | Path) -> list[dict[str, Any]]:
+def load_baseline(
+    baseline_path: str | Path, missing_ok: bool = True
+) -> list[dict[str, Any]]:
     """
     Load baseline from JSON file.
 
     Args:
         baseline_path: Path to baseline file
+        missing_ok: Return an empty baseline if the file does not exist
+            (default: True)
 
     Returns:
         List of baseline entry dicts
-    """
-    baseline_path = Path(baseline_path)
-
-    if not baseline_path.exists():
-        return []
 
-    with open(baseline_path, encoding="utf-8") as fp:
-        return json.load(fp)
+    Raises:
+        FileNotFoundError: If the file does not exist and missing_ok is False
+    """
+    try:
+        with open(baseline_path, encoding="utf-8") as fp:
+            return json.load(fp)
+    except FileNotFoundError:
+        if missing_ok:
+            return []
+        raise
 
 
 def compare_baseline(
-    current_findings: list[dict[str, Any]], baseline_path: str | Path
+    current_findings: list[dict[str, Any]],
+    baseline_path: str | Path,
+    *,
+    baseline: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
     """
     Compare current findings against baseline.
@@ -251,11 +263,13 @@ def compare_baseline(
     Args:
         current_findings: Current finding dicts with stable_id
         baseline_path: Path to baseline file
+        baseline: Entries already loaded from baseline_path (skips reading it)
 
     Returns:
         Comparison result with added/removed/changed/existing
     """
-    baseline = load_baseline(baseline_path)
+    if baseline is None:
+        baseline = load_baseline(baseline_path)
 
     # Build maps by stable_id
     baseline_map = {entry["stable_id"]: entry for entry in baseline}
@@ -289,3 +303,116 @@ def compare_baseline(
         "changed": sorted(changed, key=lambda x: x["stable_id"]),
         "existing": [current_map[sid] for sid in sorted(common_ids - {c["stable_id"] for c in changed})],
     }
+
+
+def snapshot_files(target: str | Path) -> dict[str, list[int]]:
+    """
+    Record (mtime_ns, size) for every file an analysis of target reads.
+
+    Take the snapshot before analysis starts: a file edited while the
+    analysis runs then no longer matches it.
+
+    Args:
+        target: Directory or file to analyze
+
+    Returns:
+        Mapping of file path to [mtime_ns, size]
+    """
+    snapshot = {}
+    for path in collect_analysis_files(Path(target)):
+        try:
+            st = path.stat()
+        except OSError:
+            # Vanished since the walk; leaving it out marks the snapshot stale
+            continue
+        snapshot[str(path)] = [st.st_mtime_ns, st.st_size]
+    return snapshot
+
+
+def save_latest_findings(
+    findings: list[dict[str, Any]],
+    target: str | Path,
+    rules: list[str] | None,
+    output_path: str | Path,
+    files: dict[str, list[int]],
+) -> None:
+    """
+    Save the findings of the latest analysis run for reuse by reports.
+
+    Args:
+        findings: Finding dicts (as produced by UnifiedIssue.to_dict)
+        target: Target the analysis ran on
+        rules: Rule filter used for the run (None = all rules)
+        output_path: Cache file path (e.g. .ace/latest-findings.json)
+        files: snapshot_files(target) taken before the analysis started
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = {
+        "version": __version__,
+        "target": str(target),
+        "rules": sorted(r.upper() for r in rules) if rules else None,
+        "files": files,
+        "findings": findings,
+    }
+
+    output_path.write_bytes(dumps_pretty(data, sort_keys=True) + b"\n")
+
+
+def load_findings(path: str | Path) -> list[dict[str, Any]]:
+    """
+    Load finding dicts from `ace analyze` output or a latest-findings cache.
+
+    Args:
+        path: JSON file holding either a list of findings or the
+            save_latest_findings() envelope
+
+    Returns:
+        List of finding dicts
+    """
+    with open(path, encoding="utf-8") as fp:
+        data = json.load(fp)
+
+    if isinstance(data, dict):
+        return data.get("findings", [])
+    return data
+
+
+def load_latest_findings(
+    cache_path: str | Path, target: str | Path, rules: list[str] | None
+) -> list[dict[str, Any]] | None:
+    """
+    Load cached findings if they were produced for this target and rule set
+    and the target's analyzed files are exactly those recorded in the cache
+    (same paths, mtimes and sizes).
+
+    Args:
+        cache_path: Cache file written by save_latest_findings()
+        target: Target about to be reported on
+        rules: Rule filter about to be used (None = all rules)
+
+    Returns:
+        Finding dicts, or None if the cache is missing, mismatched or stale
+    """
+    cache_path = Path(cache_path)
+    try:
+        with open(cache_path, encoding="utf-8") as fp:
+            data = json.load(fp)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != __version__
+        or data.get("target") != str(target)
+        or data.get("rules") != (sorted(r.upper() for r in rules) if rules else None)
+    ):
+        return None
+
+    # Stale if any analyzed file was added, deleted or changed since the
+    # snapshot taken before that analysis ran
+    if data.get("files") != snapshot_files(target):
+        return None
+
+    return data.get("findings", [])
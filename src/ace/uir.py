@@ -57,6 +57,27 @@ class UnifiedIssue:
             "stable_id": stable_id(self.file, self.rule, self.snippet),
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "UnifiedIssue":
+        """
+        Rebuild a UIR from a dictionary produced by to_dict().
+
+        Args:
+            data: Finding dictionary (extra keys such as stable_id are ignored)
+
+        Returns:
+            UnifiedIssue instance
+        """
+        return cls(
+            file=data["file"],
+            line=data["line"],
+            rule=data["rule"],
+            severity=Severity(data["severity"]),
+            message=data["message"],
+            suggestion=data.get("suggestion", ""),
+            snippet=data.get("snippet", ""),
+        )
+
 
 def stable_id(file: str, rule: str, snippet: str) -> str:
     """
@@ -1,15 +1,27 @@
 """Watch mode - Lightweight file change detection and auto-analysis.
 
 Simple polling-based watch (no heavy dependencies). Detects file changes and
-runs incremental analysis automatically.
+runs incremental analysis automatically. When the optional `watchdog` package
+is installed, EventWatcher uses kernel file events (inotify/FSEvents/kqueue)
+instead of rescanning the tree.
 """
 
 import hashlib
+import queue
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object  # type: ignore
+    WATCHDOG_AVAILABLE = False
+
 
 @dataclass
 class FileSnapshot:
@@ -215,6 +227,106 @@ class FileWatcher:
             time.sleep(self.poll_interval)
 
 
+class _QueueEventHandler(FileSystemEventHandler):  # type: ignore[misc]
+    """Push paths of file events onto a queue."""
+
+    def __init__(self, events: "queue.Queue[str]"):
+        super().__init__()
+        self.events = events
+
+    def on_any_event(self, event: Any) -> None:
+        if event.is_directory:
+            return
+        self.events.put(event.src_path)
+        dest_path = getattr(event, "dest_path", "")
+        if dest_path:
+            self.events.put(dest_path)
+
+
+class EventWatcher:
+    """
+    Event-driven file watcher backed by watchdog.
+
+    Wakes only on actual filesystem events, so an idle tree costs nothing.
+    Requires the optional `watchdog` package (check WATCHDOG_AVAILABLE).
+    """
+
+    def __init__(
+        self, target: Path, debounce_time: float = 0.2, max_batch_time: float | None = None
+    ):
+        """
+        Initialize event watcher.
+
+        Args:
+            target: Directory or file to watch
+            debounce_time: Quiet period used to batch bursts of events
+            max_batch_time: Longest a batch keeps collecting events after the
+                first one (default: 5 debounce periods)
+        """
+        if not WATCHDOG_AVAILABLE:
+            raise RuntimeError("EventWatcher requires watchdog. Install with: pip install watchdog")
+
+        self.target = target
+        self.debounce_time = debounce_time
+        self.max_batch_time = (
+            max_batch_time if max_batch_time is not None else 5 * debounce_time
+        )
+        self.events: queue.Queue[str] = queue.Queue()
+        self._observer: Any = None
+
+    def start(self) -> None:
+        """Start receiving filesystem events."""
+        watch_dir = self.target.parent if self.target.is_file() else self.target
+        self._observer = Observer()
+        self._observer.schedule(
+            _QueueEventHandler(self.events), str(watch_dir), recursive=True
+        )
+        self._observer.start()
+
+    def stop(self) -> None:
+        """Stop the observer thread."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def wait_for_paths(self, timeout: float | None = None) -> list[Path]:
+        """
+        Wait for file events and return the touched paths.
+
+        Blocks until the first event (or timeout), then keeps draining until
+        no new event arrives for debounce_time, or max_batch_time has passed
+        since the first event (so a steady stream of writes, e.g. a log file,
+        can't hold the batch open forever).
+
+        Args:
+            timeout: Maximum time to wait for the first event (None = forever)
+
+        Returns:
+            Sorted, de-duplicated paths (empty list on timeout)
+        """
+        try:
+            first = self.events.get(timeout=timeout)
+        except queue.Empty:
+            return []
+
+        paths = {first}
+        deadline = time.monotonic() + self.max_batch_time
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                paths.add(self.events.get(timeout=min(self.debounce_time, remaining)))
+            except queue.Empty:
+                break
+
+        changed = sorted(Path(p) for p in paths)
+        if self.target.is_file():
+            changed = [p for p in changed if p == self.target]
+        return changed
+
+
 def watch_loop(
     target: Path,
     poll_interval: float = 1.0,
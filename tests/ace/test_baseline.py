@@ -1,11 +1,21 @@
 """Tests for ACE baseline system."""
 
 import json
+import os
 import tempfile
 from pathlib import Path
 
+import pytest
+
 from ace.kernel import run_analyze
-from ace.storage import compare_baseline, load_baseline, save_baseline
+from ace.storage import (
+    compare_baseline,
+    load_baseline,
+    load_latest_findings,
+    save_baseline,
+    save_latest_findings,
+    snapshot_files,
+)
 
 
 def test_baseline_save_and_load():
@@ -199,6 +209,33 @@ def test_baseline_load_nonexistent():
         assert loaded == []
 
 
+def test_baseline_load_nonexistent_strict():
+    """Test missing_ok=False surfaces a missing baseline."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        baseline_path = Path(tmpdir) / "nonexistent.json"
+        with pytest.raises(FileNotFoundError):
+            load_baseline(baseline_path, missing_ok=False)
+
+
+def test_baseline_compare_preloaded():
+    """Test comparing against already loaded baseline entries."""
+    findings = [
+        {"stable_id": "abc", "rule": "R1", "severity": "high", "file": "a.py", "message": "A"},
+    ]
+
+    # The preloaded entries win; the (missing) file is never read
+    comparison = compare_baseline(findings, "missing-baseline.json", baseline=[])
+
+    assert [f["stable_id"] for f in comparison["added"]] == ["abc"]
+    assert comparison["removed"] == []
+
+
+def test_baseline_compare_requires_path():
+    """Test baseline_path stays a required argument."""
+    with pytest.raises(TypeError):
+        compare_baseline([])
+
+
 def test_baseline_end_to_end():
     """Test baseline workflow end-to-end."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -295,3 +332,85 @@ def test_baseline_only_stores_required_fields():
         assert "line" not in entry  # line is not stored in baseline
         assert "snippet" not in entry
         assert "suggestion" not in entry
+
+
+def test_latest_findings_reused_until_target_changes():
+    """Test latest findings cache is only returned while fresh and matching."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target = Path(tmpdir) / "src"
+        target.mkdir()
+        test_file = target / "test.py"
+        test_file.write_text("x = 1   \n", encoding="utf-8")
+
+        files = snapshot_files(target)
+        findings = [f.to_dict() for f in run_analyze(target, use_cache=False)]
+        cache_path = Path(tmpdir) / "latest-findings.json"
+        save_latest_findings(findings, target, None, cache_path, files)
+
+        assert load_latest_findings(cache_path, target, None) == findings
+        # Different rule filter or target does not match
+        assert load_latest_findings(cache_path, target, ["PY-S310-TRAILING-WS"]) is None
+        assert load_latest_findings(cache_path, Path(tmpdir), None) is None
+
+        # Touching a file in the target makes the cache stale
+        st = test_file.stat()
+        os.utime(test_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert load_latest_findings(cache_path, target, None) is None
+
+
+def _save_fresh_findings(target: Path, cache_path: Path) -> None:
+    """Analyze target and save its findings with a snapshot taken first."""
+    files = snapshot_files(target)
+    findings = [f.to_dict() for f in run_analyze(target, use_cache=False)]
+    save_latest_findings(findings, target, None, cache_path, files)
+
+
+def test_latest_findings_stale_after_file_deleted():
+    """Test deleting an analyzed file invalidates the latest findings cache."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target = Path(tmpdir) / "src"
+        target.mkdir()
+        (target / "keep.py").write_text("x = 1\n", encoding="utf-8")
+        (target / "gone.py").write_text("y = 2   \n", encoding="utf-8")
+        cache_path = Path(tmpdir) / "latest-findings.json"
+        _save_fresh_findings(target, cache_path)
+        assert load_latest_findings(cache_path, target, None) is not None
+
+        (target / "gone.py").unlink()
+
+        assert load_latest_findings(cache_path, target, None) is None
+
+
+def test_latest_findings_stale_after_edit_during_analysis():
+    """Test a file edited after the snapshot is stale even if older than the cache."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target = Path(tmpdir) / "src"
+        target.mkdir()
+        test_file = target / "test.py"
+        test_file.write_text("x = 1\n", encoding="utf-8")
+        cache_path = Path(tmpdir) / "latest-findings.json"
+
+        files = snapshot_files(target)
+        findings = [f.to_dict() for f in run_analyze(target, use_cache=False)]
+        # Edited mid-analysis: the new mtime still predates the cache file
+        test_file.write_text("x = 1   \n", encoding="utf-8")
+        save_latest_findings(findings, target, None, cache_path, files)
+        assert test_file.stat().st_mtime <= cache_path.stat().st_mtime
+
+        assert load_latest_findings(cache_path, target, None) is None
+
+
+def test_latest_findings_tracks_all_analyzed_dirs():
+    """Test edits under directories analysis walks (e.g. node_modules) are noticed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target = Path(tmpdir) / "src"
+        vendored = target / "node_modules" / "pkg"
+        vendored.mkdir(parents=True)
+        (vendored / "setup.sh").write_text("echo hi\n", encoding="utf-8")
+        cache_path = Path(tmpdir) / "latest-findings.json"
+        _save_fresh_findings(target, cache_path)
+        assert load_latest_findings(cache_path, target, None) is not None
+
+        (vendored / "setup.sh").write_text("#!/bin/sh\necho changed\n", encoding="utf-8")
+
+        assert load_latest_findings(cache_path, target, None) is None
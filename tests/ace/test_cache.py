@@ -1,11 +1,12 @@
 """Tests for ACE analysis cache system."""
 
 import json
+import sqlite3
 import tempfile
 import time
 from pathlib import Path
 
-from ace.kernel import run_analyze
+from ace.kernel import iter_analyze, run_analyze
 from ace.storage import AnalysisCache, compute_file_hash, compute_ruleset_hash
 
 
@@ -202,6 +203,58 @@ def test_analyze_with_cache_identical_to_no_cache():
         assert output_no_cache == output_warm
 
 
+def test_iter_analyze_matches_run_analyze():
+    """Test that streamed findings come out in the same order as run_analyze."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in ("b.py", "a.py", "c/d.py"):
+            test_file = Path(tmpdir) / name
+            test_file.parent.mkdir(exist_ok=True)
+            test_file.write_text(
+                "x = eval('1')  \ny = exec('2')\ntry:\n    pass\nexcept:\n    pass\n",
+                encoding="utf-8",
+            )
+
+        findings = run_analyze(tmpdir, use_cache=False)
+        expected = sorted(findings, key=lambda f: (f.file, f.line, f.rule))
+        assert len(expected) > 3
+        assert findings == expected
+        assert list(iter_analyze(tmpdir, use_cache=False)) == expected
+        assert list(iter_analyze(tmpdir, use_cache=False, jobs=3)) == expected
+
+
+def test_iter_analyze_sorts_cached_findings():
+    """Test findings restored from an unsorted cache entry are still sorted."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = Path(tmpdir) / "test.py"
+        test_file.write_text(
+            "x = eval('1')  \ny = exec('2')\ntry:\n    pass\nexcept:\n    pass\n",
+            encoding="utf-8",
+        )
+        cache_dir = Path(tmpdir) / "cache"
+
+        expected = run_analyze(test_file, use_cache=True, cache_dir=str(cache_dir))
+        assert len(expected) > 1
+
+        # Simulate an entry written before findings were sorted per file
+        conn = sqlite3.connect(cache_dir / "cache.db")
+        try:
+            for path, sha256, ruleset, findings_json in conn.execute(
+                "SELECT path, sha256, ruleset, findings_json FROM cache_entries"
+            ).fetchall():
+                reordered = json.dumps(json.loads(findings_json)[::-1])
+                conn.execute(
+                    "UPDATE cache_entries SET findings_json = ? "
+                    "WHERE path = ? AND sha256 = ? AND ruleset = ?",
+                    (reordered, path, sha256, ruleset),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+        cached = list(iter_analyze(test_file, use_cache=True, cache_dir=str(cache_dir)))
+        assert [f.to_dict() for f in cached] == [f.to_dict() for f in expected]
+
+
 def test_analyze_with_no_cache_flag():
     """Test --no-cache flag disables caching."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -42,6 +42,25 @@ def test_cli_version():
     assert "ACE v0.6.0" in output, f"Expected 'ACE v0.6.0', got: {output}"
 
 
+def test_cli_import_keeps_kernel_importable():
+    """Test importing ace.cli first leaves `import ace.kernel` working normally."""
+    code = (
+        "import sys\n"
+        "import ace.cli\n"
+        "assert 'ace.kernel' not in sys.modules\n"
+        "import ace.kernel\n"
+        "ace.kernel.run_analyze\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
 def test_analyze_stub():
     """Test that ace analyze works with empty directory."""
     with tempfile.TemporaryDirectory() as tmpdir:
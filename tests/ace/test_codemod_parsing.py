@@ -0,0 +1,114 @@
+"""Tests for shared codemod parsing and the on-disk parse cache."""
+
+import os
+import pickle
+
+import pytest
+
+from ace.codemods import parsing
+from ace.codemods.parsing import parse_module_cached, set_disk_cache_dir
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    """Enable the disk cache in a temp dir, with a cold in-process cache."""
+    # Keep the signing key out of the real user cache
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "user-cache"))
+    parse_module_cached.cache_clear()
+    set_disk_cache_dir(tmp_path / "repo")
+    yield tmp_path / "repo"
+    set_disk_cache_dir(None)
+    parse_module_cached.cache_clear()
+
+
+def test_disk_cache_round_trip(disk_cache):
+    """Test a parsed module is pickled and reused after the memory cache is cleared."""
+    source = "import os\n\nx = os.path.join('a', 'b')\n"
+
+    tree = parse_module_cached(source)
+    entries = list((disk_cache / "cst-cache").rglob("*.pkl"))
+    assert len(entries) == 1
+
+    parse_module_cached.cache_clear()
+    cached = parse_module_cached(source)
+
+    assert cached is not tree
+    assert cached.code == source
+    assert cached.deep_equals(tree)
+
+
+def test_disk_cache_corrupt_entry_is_reparsed(disk_cache):
+    """Test an unreadable cache entry falls back to parsing and is rewritten."""
+    source = "y = 1\n"
+    path = parsing._cache_path(disk_cache, source)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a pickle")
+
+    tree = parse_module_cached(source)
+
+    assert tree.code == source
+    assert path.read_bytes() != b"not a pickle"
+
+
+def test_disk_cache_disabled_by_default(tmp_path, monkeypatch):
+    """Test nothing is written unless a cache dir is configured."""
+    monkeypatch.chdir(tmp_path)
+    parse_module_cached.cache_clear()
+
+    parse_module_cached("z = 2\n")
+
+    assert parsing.get_disk_cache_dir() is None
+    assert not any(tmp_path.iterdir())
+
+
+class _Exploit:
+    """Pickle payload that would create a marker file when unpickled."""
+
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (open, (self.marker, "w"))
+
+
+def test_disk_cache_never_unpickles_unsigned_entries(disk_cache, tmp_path):
+    """Test a planted entry (e.g. shipped in a repo) is not unpickled."""
+    source = "z = 3\n"
+    marker = tmp_path / "pwned"
+    path = parsing._cache_path(disk_cache, source)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"\0" * 32 + pickle.dumps(_Exploit(str(marker))))
+
+    tree = parse_module_cached(source)
+
+    assert tree.code == source
+    assert not marker.exists()
+    # The entry was replaced by a properly signed one
+    parse_module_cached.cache_clear()
+    assert parse_module_cached(source).code == source
+
+
+def test_disk_cache_signing_key_lives_outside_cache_dir(disk_cache, tmp_path):
+    """Test the key is created per user, readable only by its owner."""
+    parse_module_cached("k = 1\n")
+
+    key_path = tmp_path / "user-cache" / "ace" / "cst-cache.key"
+    assert key_path.stat().st_size == 32
+    assert key_path.stat().st_mode & 0o077 == 0
+    assert not list(disk_cache.rglob("*.key"))
+
+
+def test_prune_disk_cache_drops_least_recently_used(disk_cache):
+    """Test pruning removes the oldest entries until the size limit holds."""
+    sources = [f"v{i} = {i}\n" for i in range(3)]
+    for i, source in enumerate(sources):
+        parse_module_cached(source)
+        path = parsing._cache_path(disk_cache, source)
+        os.utime(path, ns=(0, (i + 1) * 10**9))
+
+    sizes = [parsing._cache_path(disk_cache, s).stat().st_size for s in sources]
+    removed = parsing.prune_disk_cache(max_bytes=sizes[1] + sizes[2])
+
+    assert removed == 1
+    assert not parsing._cache_path(disk_cache, sources[0]).exists()
+    assert parsing._cache_path(disk_cache, sources[2]).exists()
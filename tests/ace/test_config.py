@@ -223,6 +223,19 @@ def test_should_include_file_excludes_take_precedence():
     assert should_include_file("node_modules/package/test.py", config) is False
 
 
+def test_should_include_file_recursive_patterns_at_any_depth():
+    """Test ** patterns match at the top level and in deep paths."""
+    config = get_default_config()
+    config.includes = ["**/*.py"]
+    config.excludes = ["**/.venv/**"]
+
+    deep = "/".join(f"d{i}" for i in range(50))
+    assert should_include_file("top.py", config) is True
+    assert should_include_file(f"{deep}/mod.py", config) is True
+    assert should_include_file(f"{deep}/mod.txt", config) is False
+    assert should_include_file(f"{deep}/.venv/lib/mod.py", config) is False
+
+
 def test_merge_config_rules():
     """Test merging rule configurations."""
     base = get_default_config()
@@ -267,3 +267,24 @@ def test_rank_with_limit():
         scores = ranker.rank_files(limit=5)
 
         assert len(scores) == 5
+
+
+def test_score_file_memoized_until_rebuild():
+    """Test file scores are reused per ranker and dropped when the map is rebuilt."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "mod.py").write_text("def one(): pass\n")
+
+        repo_map = RepoMap().build(root)
+        ranker = ContextRanker(repo_map, current_time=int(time.time()))
+
+        first = ranker._score_file("mod.py")
+        assert ranker._score_file("mod.py") is first
+        assert ranker._score_file("mod.py", query="one") is not first
+
+        (root / "mod.py").write_text("def one(): pass\ndef two(): pass\nclass Three: pass\n")
+        repo_map.build(root)
+
+        rebuilt = ranker._score_file("mod.py")
+        assert rebuilt is not first
+        assert rebuilt.symbol_count == 3
@@ -17,7 +17,7 @@ from ace.policy import (
     rstar,
 )
 from ace.safety import content_hash, is_idempotent, verify_parse_py, verify_parseable
-from ace.uir import Severity, create_uir, stable_id
+from ace.uir import Severity, UnifiedIssue, create_uir, stable_id
 
 # ============================================================================
 # UIR Module Tests
@@ -117,6 +117,12 @@ class TestUnifiedIssue:
         assert "stable_id" in data
         assert isinstance(data["stable_id"], str)
 
+    def test_uir_from_dict_roundtrip(self):
+        """Test UIR from_dict restores an equal record from to_dict output."""
+        uir = create_uir("test.py", 42, "unused-import", "high", "Unused import", "Remove it", "import os")
+
+        assert UnifiedIssue.from_dict(uir.to_dict()) == uir
+
     def test_uir_immutable(self):
         """Test that UIR is immutable (frozen)."""
         uir = create_uir("test.py", 1, "rule", "info", "Test")
@@ -287,3 +287,50 @@ def main():
 
             # Content should be the same
             assert first_content == second_content
+
+    def test_codemod_keeps_other_statements_on_line(self):
+        """Test that pruning one import keeps the rest of a `;` line."""
+        from ace.codemods.dead_imports import DeadImportsCodemod
+
+        code = "import os; import sys; x = 1\nprint(sys.argv, x)\n"
+
+        plan = DeadImportsCodemod.plan(code, "test.py")
+
+        assert plan.edits[0].payload == "import sys; x = 1\nprint(sys.argv, x)\n"
+
+    def test_codemod_drops_trailing_alias_cleanly(self):
+        """Test that removing the last alias leaves valid syntax."""
+        from ace.codemods.dead_imports import DeadImportsCodemod
+
+        code = "from dataclasses import dataclass, field\n\n@dataclass\nclass A:\n    x: int = 1\n"
+
+        plan = DeadImportsCodemod.plan(code, "test.py")
+
+        payload = plan.edits[0].payload
+        assert payload.startswith("from dataclasses import dataclass\n")
+        assert validate_python_syntax(payload)
+
+    def test_codemod_keeps_parenthesized_import_layout(self):
+        """Test that pruning a multi-line parenthesized import keeps its shape."""
+        from ace.codemods.dead_imports import DeadImportsCodemod
+
+        code = (
+            "from os.path import (\n"
+            "    basename,\n"
+            "    dirname,\n"
+            "    join,\n"
+            ")\n"
+            "\n"
+            "print(basename, dirname)\n"
+        )
+
+        plan = DeadImportsCodemod.plan(code, "test.py")
+
+        assert plan.edits[0].payload == (
+            "from os.path import (\n"
+            "    basename,\n"
+            "    dirname,\n"
+            ")\n"
+            "\n"
+            "print(basename, dirname)\n"
+        )
@@ -3,7 +3,7 @@
 import tempfile
 from pathlib import Path
 
-from ace.index import ContentIndex, compute_file_hash, is_indexable
+from ace.index import ContentIndex, compute_file_hash, is_indexable, walk_indexable
 
 
 def test_content_index_add_file():
@@ -197,3 +197,57 @@ def test_is_indexable_binary_file():
     """Test that binary files are not indexable."""
     assert is_indexable(Path("test.pyc")) is False
     assert is_indexable(Path("test.jpg")) is False
+
+
+def test_run_analyze_only_files():
+    """Test run_analyze restricts analysis to only_files when given."""
+    from ace.kernel import run_analyze
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        changed = Path(tmpdir) / "changed.py"
+        changed.write_text("x = 1   \n", encoding="utf-8")
+        untouched = Path(tmpdir) / "untouched.py"
+        untouched.write_text("y = 2   \n", encoding="utf-8")
+
+        findings = run_analyze(tmpdir, use_cache=False, only_files=[changed])
+
+        assert findings
+        assert {f.file for f in findings} == {str(changed)}
+
+
+def test_walk_indexable_skips_hidden_binary_and_vendor_dirs():
+    """Test walk_indexable yields only indexable files outside skipped dirs."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "pkg").mkdir()
+        (root / "pkg" / "mod.py").write_text("x = 1")
+        (root / "README.md").write_text("# hi")
+        (root / ".hidden").write_text("secret")
+        (root / "image.png").write_bytes(b"\x89PNG")
+        for skipped in (".git", "node_modules", "__pycache__"):
+            (root / skipped).mkdir()
+            (root / skipped / "inner.py").write_text("y = 2")
+
+        found = sorted(walk_indexable(root))
+
+        assert found == sorted([str(root / "README.md"), str(root / "pkg" / "mod.py")])
+
+
+def test_content_index_add_files_batch():
+    """Test add_files indexes many files and skips unreadable ones."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = []
+        for i in range(5):
+            test_file = Path(tmpdir) / f"test{i}.py"
+            test_file.write_text(f"x = {i}")
+            files.append(test_file)
+        missing = Path(tmpdir) / "missing.py"
+
+        index = ContentIndex(Path(tmpdir) / "index.json")
+        entries = index.add_files(files + [missing])
+
+        assert len(entries) == 5
+        assert str(missing) not in index.entries
+        for test_file in files:
+            assert index.entries[str(test_file)].sha256 == compute_file_hash(test_file)
+            assert index.has_changed(test_file) is False
@@ -248,3 +248,47 @@ def test_revert_plan_empty_when_no_successes():
 
         # Should be empty since no success was logged
         assert len(revert_plan) == 0
+
+
+def test_cmd_revert_flushes_diagnostics_when_interrupted(monkeypatch, capsys):
+    """Test buffered SKIP lines still reach stderr if the revert loop raises."""
+    import argparse
+
+    import pytest
+
+    from ace.cli import cmd_revert
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        journal_dir = Path(tmpdir) / "journals"
+        journal = Journal(run_id="test-007", journal_dir=journal_dir)
+
+        # Reverted last-to-first: the missing file is skipped, then the
+        # write for the present one is interrupted
+        present = Path(tmpdir) / "present.py"
+        present.write_bytes(b"y = 2\n")
+        for path in (present, Path(tmpdir) / "missing.py"):
+            journal.log_intent(
+                file=str(path),
+                before_sha=hashlib.sha256(b"y = 1\n").hexdigest(),
+                before_size=6,
+                rule_ids=[],
+                plan_id="plan-1",
+                pre_image=b"y = 1\n",
+            )
+            journal.log_success(
+                file=str(path),
+                after_sha=hashlib.sha256(b"y = 2\n").hexdigest(),
+                after_size=6,
+                receipt_id="receipt-1",
+            )
+        journal.close()
+
+        def interrupted_write(*args, **kwargs):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr("ace.safety.atomic_write", interrupted_write)
+
+        with pytest.raises(KeyboardInterrupt):
+            cmd_revert(argparse.Namespace(journal=str(journal_dir / "test-007.jsonl")))
+
+        assert "SKIP" in capsys.readouterr().err
@@ -0,0 +1,50 @@
+"""Tests for ACE JSON serialization helpers."""
+
+import json
+
+from ace.jsonio import dumps_compact, dumps_pretty
+from ace.uir import Severity, UnifiedIssue
+
+
+def test_dumps_pretty_matches_stdlib():
+    """Test output matches json.dumps(indent=2) for ASCII data."""
+    data = {"b": [1, 2.5, None], "a": {"z": True, "y": "text"}}
+
+    for sort_keys in (False, True):
+        expected = json.dumps(data, indent=2, sort_keys=sort_keys).encode("utf-8")
+        assert dumps_pretty(data, sort_keys=sort_keys) == expected
+
+
+def test_dumps_pretty_default_hook_for_dataclasses():
+    """Test dataclasses are serialized through the default hook."""
+    issue = UnifiedIssue("a.py", 1, "PY-E201-BROAD-EXCEPT", Severity.HIGH, "bare except")
+
+    out = dumps_pretty([issue], sort_keys=True, default=lambda o: o.to_dict())
+
+    assert json.loads(out) == [issue.to_dict()]
+
+
+def test_dumps_match_stdlib_for_non_ascii_and_floats():
+    """Test output bytes don't depend on whether orjson is installed."""
+    data = {
+        "file": "src/caf\u00e9/na\u00efve.py",
+        "message": "\u2713 done \U0001f600 \x7f",
+        "scores": [1e-07, 2.5e-05, 0.0001, 1e16, 1.5e300, 0.5, -3e-9],
+        "big": 2**70,
+    }
+
+    for sort_keys in (False, True):
+        pretty = json.dumps(data, indent=2, sort_keys=sort_keys).encode("utf-8")
+        compact = json.dumps(data, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
+        assert dumps_pretty(data, sort_keys=sort_keys) == pretty
+        assert dumps_compact(data, sort_keys=sort_keys) == compact
+        assert dumps_pretty(data, sort_keys=sort_keys).isascii()
+
+
+def test_dumps_match_stdlib_for_non_string_keys():
+    """Test integer keys are converted and sorted like json.dumps does."""
+    data = {10: "a", 2: "b"}
+
+    expected = json.dumps(data, indent=2, sort_keys=True).encode("utf-8")
+    assert dumps_pretty(data, sort_keys=True) == expected
+
@@ -0,0 +1,18 @@
+"""Tests for ACE built-in codemod packs."""
+
+from ace.packs_builtin import apply_pack_to_directory
+
+
+def test_apply_pack_to_directory_parallel_matches_sequential(tmp_path):
+    """Test worker processes produce the same plans as a sequential run."""
+    for i in range(4):
+        (tmp_path / f"mod{i}.py").write_text(
+            f"from dataclasses import dataclass\n\n@dataclass\nclass C{i}:\n    x: int\n"
+        )
+    (tmp_path / "plain.py").write_text("x = 1\n")
+
+    sequential = apply_pack_to_directory("PY_DATACLASS_SLOTS", tmp_path)
+    parallel = apply_pack_to_directory("PY_DATACLASS_SLOTS", tmp_path, jobs=2)
+
+    assert len(sequential) == 4
+    assert [p.to_dict() for p in parallel] == [p.to_dict() for p in sequential]
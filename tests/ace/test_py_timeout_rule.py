@@ -105,6 +105,21 @@ class TestHttpTimeoutRule:
             assert receipt["invariants_met"] is True
             assert receipt["before_hash"] != receipt["after_hash"]
 
+    def test_refactor_reuses_given_findings(self):
+        """Test that run_refactor plans from passed-in findings."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = Path(tmpdir) / "api.py"
+            test_file.write_text(SAMPLE_CODE_WITH_ISSUE, encoding="utf-8")
+
+            findings = run_analyze(str(test_file))
+            plans = run_refactor(str(test_file), findings=findings)
+            assert [p.to_dict() for p in plans] == [
+                p.to_dict() for p in run_refactor(str(test_file))
+            ]
+
+            # No findings given means nothing to refactor
+            assert run_refactor(str(test_file), findings=[]) == []
+
     def test_apply_writes_changes(self):
         """Test that apply successfully writes changes to file."""
         with tempfile.TemporaryDirectory() as tmpdir:
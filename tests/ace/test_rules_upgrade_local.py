@@ -14,7 +14,7 @@ def test_init_rules():
         rules_path = tmpdir / ".ace" / "rules.json"
 
         # Initialize rules
-        init_rules(rules_path)
+        written = init_rules(rules_path)
 
         # Should create the file
         assert rules_path.exists()
@@ -23,6 +23,10 @@ def test_init_rules():
         version = get_rules_version(rules_path)
         assert version != "unknown"
         assert len(version) > 0
+        assert written == version
+
+        # Re-initializing keeps the file and reports its version
+        assert init_rules(rules_path) == version
 
 
 def test_bump_rules_version_creates_deterministic_file():
@@ -1,13 +1,16 @@
 """Tests for watch mode."""
 
 import tempfile
+import threading
 import time
 from pathlib import Path
 
 import pytest
 
 from ace.watch import (
+    WATCHDOG_AVAILABLE,
     ChangeSet,
+    EventWatcher,
     FileSnapshot,
     FileWatcher,
     debounce_changes,
@@ -177,6 +180,61 @@ class TestFileWatcher:
             assert changes.deleted[0].name == "test.py"
 
 
+@pytest.mark.skipif(not WATCHDOG_AVAILABLE, reason="watchdog not installed")
+class TestEventWatcher:
+    """Tests for EventWatcher (requires watchdog)."""
+
+    def test_reports_written_file(self):
+        """Test that a file write is delivered as a changed path."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+
+            watcher = EventWatcher(tmpdir_path, debounce_time=0.1)
+            watcher.start()
+            try:
+                (tmpdir_path / "test.py").write_text("print('test')")
+                paths = watcher.wait_for_paths(timeout=5)
+            finally:
+                watcher.stop()
+
+            assert any(p.name == "test.py" for p in paths)
+
+    def test_steady_events_cannot_starve_the_batch(self):
+        """Test that a batch is cut off at max_batch_time under constant writes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = EventWatcher(Path(tmpdir), debounce_time=0.1, max_batch_time=0.3)
+            stop = threading.Event()
+
+            def produce():
+                # Faster than the debounce period, forever
+                while not stop.is_set():
+                    watcher.events.put(str(Path(tmpdir) / "app.log"))
+                    time.sleep(0.01)
+
+            producer = threading.Thread(target=produce, daemon=True)
+            producer.start()
+            try:
+                start = time.monotonic()
+                paths = watcher.wait_for_paths(timeout=5)
+                elapsed = time.monotonic() - start
+            finally:
+                stop.set()
+                producer.join()
+
+            assert [p.name for p in paths] == ["app.log"]
+            assert elapsed < 2
+
+    def test_timeout_returns_empty(self):
+        """Test that an idle tree returns no paths after the timeout."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = EventWatcher(Path(tmpdir))
+            watcher.start()
+            try:
+                assert watcher.wait_for_paths(timeout=0.1) == []
+            finally:
+                watcher.stop()
+
+
 class TestFormatChangeSummary:
     """Tests for change summary formatting."""
 
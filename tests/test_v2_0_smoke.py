@@ -227,6 +227,30 @@ def test_llm_cache_persistence():
     cache_path.unlink(missing_ok=True)
 
 
+def test_llm_summarize_diff_cache_ignores_hunk_line_numbers():
+    """Test that shifted hunks of the same change reuse the cached summary."""
+    from ace.llm import LLMAssist, LLMCache, LLMProvider
+
+    class CountingProvider(LLMProvider):
+        calls = 0
+
+        def complete(self, prompt: str, max_tokens: int = 100) -> str:
+            CountingProvider.calls += 1
+            return "Add retry"
+
+    cache_path = Path("/tmp/test_llm_diff_cache.json")
+    cache_path.unlink(missing_ok=True)
+
+    assist = LLMAssist(provider=CountingProvider(), cache=LLMCache(cache_path=cache_path))
+
+    assert assist.summarize_diff("@@ -1,2 +1,3 @@\n+retry()\n") == "Add retry"
+    assert assist.summarize_diff("@@ -40,2 +41,3 @@\n+retry()\n") == "Add retry"
+    assert CountingProvider.calls == 1
+
+    # Clean up
+    cache_path.unlink(missing_ok=True)
+
+
 def test_ollama_provider_detection():
     """Test OllamaProvider auto-detection from env var."""
     from ace.llm import LLMAssist, OllamaProvider
@@ -274,7 +298,7 @@ def test_cli_check_strict():
     )
 
     # Mock run_analyze to return findings
-    with patch("ace.cli.run_analyze") as mock_analyze:
+    with patch("ace.kernel.run_analyze") as mock_analyze:
         mock_analyze.return_value = [MagicMock()]  # Non-empty findings
 
         # Strict mode should fail with findings
@@ -291,6 +315,149 @@ def test_cli_assist_imports():
     assert callable(cmd_commitmsg)
 
 
+def test_cli_read_line_window(tmp_path):
+    """Test that assist reads only the requested window of lines."""
+    from ace.cli import _read_line_window
+
+    path = tmp_path / "mod.py"
+    path.write_text("a\nb\nc\nd\ne\n", encoding="utf-8")
+
+    assert _read_line_window(path, 2) == ["c\n"]
+    assert _read_line_window(path, 0, before=2, after=2) == ["a\n", "b\n", "c\n"]
+    assert _read_line_window(path, 4, before=2, after=2) == ["c\n", "d\n", "e\n"]
+    assert _read_line_window(path, 5) is None
+    assert _read_line_window(path, -1) is None
+
+
+def test_cli_sniff_command():
+    """Test that main() can find the subcommand before building parsers."""
+    from ace.cli import _PARSER_BUILDERS, _sniff_command
+
+    assert _sniff_command(["analyze", "--target", "."]) == "analyze"
+    assert _sniff_command(["--verbose", "--config", "ace.toml", "check"]) == "check"
+    assert _sniff_command(["--version"]) is None
+    assert "install-pre-commit" in _PARSER_BUILDERS
+
+
+def test_cli_parse_rules():
+    """Test --rules parsing strips whitespace and empty entries."""
+    from ace.cli import _parse_rules
+
+    assert _parse_rules(None) is None
+    assert _parse_rules("") is None
+    assert _parse_rules(" , ") is None
+    assert _parse_rules("PY-E201-BROAD-EXCEPT, PY-I101-IMPORT-SORT,") == [
+        "PY-E201-BROAD-EXCEPT",
+        "PY-I101-IMPORT-SORT",
+    ]
+
+
+def test_cli_write_json_lines():
+    """Test JSON Lines output writes one parseable object per line."""
+    import io
+
+    from ace.cli import _write_json_lines
+
+    items = [{"b": 1, "a": "x"}, {"rule": "R", "line": 2}]
+    stream = io.StringIO()
+    _write_json_lines(iter(items), stream=stream)
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == items
+    assert lines[0] == '{"a":"x","b":1}'
+
+
+def test_cli_json_output_is_ascii_like_json_dumps():
+    """Test stdout JSON matches json.dumps (ASCII-escaped) with any backend."""
+    import io
+
+    from ace.cli import _write_json_array, _write_json_lines
+
+    items = [{"file": "src/caf\u00e9.py", "message": "\u2713 ok", "score": 1e-07}]
+
+    stream = io.StringIO()
+    _write_json_array(iter(items), stream=stream)
+    assert stream.getvalue() == json.dumps(items, indent=2, sort_keys=True) + "\n"
+
+    stream = io.StringIO()
+    _write_json_lines(iter(items), stream=stream)
+    expected = json.dumps(items[0], separators=(",", ":"), sort_keys=True) + "\n"
+    assert stream.getvalue() == expected
+    assert stream.getvalue().isascii()
+
+
+def test_cli_write_json_array_error_leaves_invalid_json():
+    """Test a failure mid-stream never leaves a parseable partial array."""
+    import io
+
+    import pytest
+
+    from ace.cli import _write_json_array
+
+    def items():
+        yield {"rule": "R", "line": 1}
+        raise RuntimeError("analysis failed")
+
+    stream = io.StringIO()
+    with pytest.raises(RuntimeError):
+        _write_json_array(items(), stream=stream)
+
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(stream.getvalue())
+
+
+def test_cli_selftest_manifest_covers_analyzed_files(tmp_path):
+    """Test the selftest manifest changes whenever an analyzed file does."""
+    from ace.cli import _selftest_manifest
+
+    (tmp_path / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    vendored = tmp_path / "node_modules" / "pkg" / "build.sh"
+    vendored.parent.mkdir(parents=True)
+    vendored.write_text("#!/bin/sh\necho hi\n", encoding="utf-8")
+
+    before = _selftest_manifest(tmp_path, None)
+    assert _selftest_manifest(tmp_path, None) == before
+
+    # run_analyze reads node_modules even though the index walk skips it
+    vendored.write_text("#!/bin/sh\nset -e\necho hi\n", encoding="utf-8")
+    assert _selftest_manifest(tmp_path, None) != before
+
+
+def test_cli_selftest_manifest_covers_ace_sources(tmp_path, monkeypatch):
+    """Test editing ACE's own code (same version) invalidates the manifest."""
+    from ace import cli
+
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    source_dir = tmp_path / "ace"
+    (source_dir / "skills").mkdir(parents=True)
+    rule = source_dir / "skills" / "python.py"
+    rule.write_text("RULE = 1\n", encoding="utf-8")
+    monkeypatch.setattr(cli, "ACE_SOURCE_DIR", source_dir)
+
+    before = cli._selftest_manifest(target, None)
+    rule.write_text("RULE = 2\n", encoding="utf-8")
+
+    assert cli._selftest_manifest(target, None) != before
+
+
+def test_cli_hook_entry(tmp_path, monkeypatch):
+    """Test the argparse-free entry point used by the pre-commit hook."""
+    from ace.cli import _hook_entry
+    from ace.errors import ExitCode
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "bad.py").write_text('x = eval("1")\n', encoding="utf-8")
+    (tmp_path / "good.py").write_text("x = 1\n", encoding="utf-8")
+    # Trailing whitespace is a low-severity finding: reported, not blocking
+    (tmp_path / "style.py").write_text("x = 1  \n", encoding="utf-8")
+
+    assert _hook_entry(["good.py"]) == ExitCode.SUCCESS
+    assert _hook_entry(["good.py", "style.py"]) == ExitCode.SUCCESS
+    assert _hook_entry(["good.py", "bad.py"]) == ExitCode.POLICY_DENY
+
+
 def test_planner_with_learning():
     """Test Planner integration with Learning."""
     from ace.planner import Planner, PlannerConfig